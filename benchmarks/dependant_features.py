@@ -0,0 +1,52 @@
+"""
+Regression benchmark of shared-commit detection used by ``no_dependant_features`` rule.
+
+Synthetic branches are built in memory, every 10th branch is chained to the previous one (it shares all its commits),
+so the result is known in advance and checked as well.
+
+    python -m benchmarks.dependant_features --branches 1000 --commits 200 --max-seconds 2
+"""
+import argparse
+import sys
+import time
+
+from gitflow_linter.visitor import DependantFeaturesVisitor
+
+
+def synthetic_branches(branches: int, commits: int) -> dict:
+    commits_in_branches = dict()
+    for branch in range(branches):
+        own = ['{:040x}'.format(branch * commits + commit) for commit in range(commits)]
+        if branch % 10 == 1:
+            own = own + commits_in_branches['feature/{}'.format(branch - 1)]
+        commits_in_branches['feature/{}'.format(branch)] = own
+    return commits_in_branches
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--branches', type=int, default=1000)
+    parser.add_argument('--commits', type=int, default=200)
+    parser.add_argument('--max-seconds', type=float, default=None,
+                        help='exit with 1 if detection takes longer (regression)')
+    args = parser.parse_args(argv)
+
+    commits_in_branches = synthetic_branches(branches=args.branches, commits=args.commits)
+    started = time.perf_counter()
+    sharing = DependantFeaturesVisitor.branches_sharing_commits(commits_in_branches)
+    elapsed = time.perf_counter() - started
+
+    expected = 2 * len([branch for branch in range(args.branches) if branch % 10 == 1])
+    print('{} branches x {} commits: {:.3f}s, {} dependant branches'.format(args.branches, args.commits, elapsed,
+                                                                            len(sharing)))
+    if len(sharing) != expected:
+        print('Expected {} dependant branches'.format(expected))
+        return 1
+    if args.max_seconds is not None and elapsed > args.max_seconds:
+        print('Regression: detection took more than {}s'.format(args.max_seconds))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,6 +13,7 @@ from gitflow_linter.rules import RulesContainer, Gitflow
 
 DEFAULT_LINTER_OPTIONS = 'gitflow_linter.yaml'
 __version__ = '0.1.0'
+WATCH_IGNORED_OPTIONS = ('out', 'fatal_warnings', 'cache', 'since_state', 'profile', 'profile_dir')
 
 
 def _validate_settings(value, working_dir):
@@ -26,6 +27,15 @@ def _validate_settings(value, working_dir):
                                  "Please provide path to the settings by using --settings option")
     return open(potential_settings, 'r')
 
+
+def _validate_watch(ctx: click.Context):
+    # --watch serves its own report, so options of a single run would be silently ignored
+    ignored = [max(param.opts, key=len) for param in ctx.command.params
+               if param.name in WATCH_IGNORED_OPTIONS and ctx.params[param.name] != param.get_default(ctx)]
+    if ignored:
+        raise click.BadParameter('{} cannot be used together with --watch'.format(', '.join(ignored)))
+
+
 def _validate_date_to(ctx, param, date_to):
     date_from = ctx.params['date_from']
     if date_from < date_to:
@@ -40,7 +50,8 @@ def _validate_date_to(ctx, param, date_to):
                                 allow_dash=False, path_type=None))
 @click.option('-s', '--settings', type=click.File(mode='r', encoding=None, errors='strict', lazy=None, atomic=False))
 @click.option('-o', '--output', 'out',
-              type=click.Choice(output.outputs.keys(), case_sensitive=False), default=next(iter(output.outputs.keys())))
+              type=click.Choice(list(output.outputs.keys()) + list(output.streaming_outputs.keys()), case_sensitive=False),
+              default=next(iter(output.outputs.keys())))
 @click.option('-p', '--fetch-prune', 'fetch', is_flag=True, default=False, help="Linter will refresh the repo before "
                                                                                 "checking")
 @click.option('-d', '--allow-dirty', is_flag=True, default=False, help="Linter will ignore the fact that the given "
@@ -49,44 +60,50 @@ def _validate_date_to(ctx, param, date_to):
                                                                           "there are warnings but no errors")
 @click.option('-F', '--date-from', type=click.DateTime(formats=["%Y-%m-%d"]), default=str(date.min), help="Issues introduced before this date will be ignored.")
 @click.option('-T', '--date-to', type=click.DateTime(formats=["%Y-%m-%d"]), default=str(date.today() + timedelta(days=1)), callback=_validate_date_to, help="Issues introduced after this date will be ignored.")
-def main(git_directory, settings, out, fetch, allow_dirty, fatal_warnings, date_from, date_to):
+@click.option('-j', '--jobs', type=click.IntRange(min=1), default=1, help="Number of rules checked concurrently.")
+@click.option('-c', '--cache', is_flag=True, default=False, help="Results of rules will be cached in the git directory "
+                                                                 "and reused until references they depend on change")
+@click.option('--since-state', 'since_state', type=click.Path(dir_okay=False, writable=True), default=None,
+              help="State of branches is recorded in the file and the next run checks again only branches changed "
+                   "since then")
+@click.option('--profile', is_flag=True, default=False, help="Time, git calls and commits loaded by every rule will be "
+                                                             "added to results (with --jobs the commit graph shared "
+                                                             "by rules is accounted to the rule loading it first)")
+@click.option('--profile-dir', 'profile_dir', type=click.Path(file_okay=False, dir_okay=True, writable=True),
+              default=None, help="cProfile statistics of every rule will be dumped to the directory (implies "
+                                 "--profile, rules are checked one by one)")
+@click.option('--watch', is_flag=True, default=False, help="Linter will keep running, check the repo again whenever "
+                                                           "its references change and serve the latest report "
+                                                           "over HTTP on localhost")
+@click.option('--port', type=click.IntRange(min=0, max=65535), default=8765, show_default=True,
+              help="Port the latest report is served on in --watch mode")
+@click.option('--interval', type=click.FloatRange(min=0.1), default=5, show_default=True,
+              help="Seconds between checks of references in --watch mode")
+@click.option('--fetch-interval', 'fetch_interval', type=click.FloatRange(min=1), default=None,
+              help="Seconds between fetches of the remote in --watch mode, the remote is not fetched by default")
+def main(git_directory, settings, out, fetch, allow_dirty, fatal_warnings, date_from, date_to, jobs, cache,
+         since_state, profile, profile_dir, watch, port, interval, fetch_interval):
     """Evaluate given repository and check if gitflow is respected"""
-    from gitflow_linter.report import Report, Section, Issue, Level
-    from gitflow_linter.visitor import StatsRepositoryVisitor
-    from gitflow_linter.repository import Repository
-
     try:
         settings = _validate_settings(settings, working_dir=git_directory)
+        if watch:
+            _validate_watch(click.get_current_context())
+            return sys.exit(_watch(git_directory, yaml_settings=yaml.load(settings, Loader=yaml.SafeLoader),
+                                   fetch=fetch, allow_dirty=allow_dirty, date_from=date_from, date_to=date_to,
+                                   jobs=jobs, port=port, interval=interval, fetch_interval=fetch_interval))
         gitflow, rules = parse_yaml(settings)
-        repo = Repository(Repo(git_directory), gitflow=gitflow, should_fetch=fetch, allow_dirty=allow_dirty)
-        report = Report(working_dir=git_directory, stats=repo.apply(StatsRepositoryVisitor(gitflow=gitflow)), sections=[])
-
-        visitors = __get_all_visitors(gitflow=gitflow, rules=rules)
-        for visitor in visitors.values():
-            try:
-                kwargs = rules.args_for(visitor.rule)
-                section: Section = repo.apply(visitor, **kwargs if kwargs else {})
-                if section is not None:
-                    if kwargs and kwargs.get('severity', None):
-                        if kwargs['severity'].lower() in list(Level):
-                            section.change_severity(to=Level(kwargs['severity'].lower()))
-                        else:
-                            output.log.warning('Provided severity "{}" is not recognized. Allowed values: [{}]'.format(
-                                kwargs['severity'], ', '.join(list(Level))))
-                    report.append(section)
-                else:
-                    output.log.warning('⚠️ Rule {} checked but result was not returned'.format(visitor.rule))
-            except BaseException as err:
-                error_section = Section(rule=visitor.rule, title='ERROR!')
-                error_section.append(Issue.error('💀 Cannot be checked because of error: {err}'.format(err=err)))
-                report.append(error_section)
-            finally:
-                rules.consume(visitor.rule)
-
-        if rules.rules:
-            output.log.warning('Some of rules cannot be validated because corresponding validators could not be found: '
-                               + ', '.join(rules.rules))
-        report.consider_issues_only_in_period(date_from, date_to)
+        if profile_dir:
+            # only one cProfile profiler can be enabled at a time
+            os.makedirs(profile_dir, exist_ok=True)
+            profile, jobs = True, 1
+        if out in output.streaming_outputs:
+            return sys.exit(_lint_streaming(git_directory, gitflow=gitflow, rules=rules, out=out, fetch=fetch,
+                                            allow_dirty=allow_dirty, fatal_warnings=fatal_warnings,
+                                            date_from=date_from, date_to=date_to, jobs=jobs, cache=cache,
+                                            since_state=since_state, profile=profile, profile_dir=profile_dir))
+        report = _lint(git_directory, gitflow=gitflow, rules=rules, fetch=fetch, allow_dirty=allow_dirty, jobs=jobs,
+                       cache=cache, since_state=since_state, profile=profile, profile_dir=profile_dir,
+                       date_from=date_from, date_to=date_to)
         output.create_output(out)(report)
         return sys.exit(1 if report.contains_errors(are_warnings_errors=fatal_warnings) else 0)
     except BaseException as err:
@@ -94,6 +111,402 @@ def main(git_directory, settings, out, fetch, allow_dirty, fatal_warnings, date_
         return sys.exit(1)
 
 
+@click.command()
+@click.argument('repos_file', type=click.File(mode='r'))
+@click.option('-s', '--settings', type=click.File(mode='r'), required=True, help="Settings shared by all repositories")
+@click.option('-o', '--output', 'out',
+              type=click.Choice(output.batch_outputs.keys(), case_sensitive=False),
+              default=next(iter(output.batch_outputs.keys())))
+@click.option('-p', '--fetch-prune', 'fetch', is_flag=True, default=False, help="Linter will refresh repos before "
+                                                                                "checking")
+@click.option('-d', '--allow-dirty', is_flag=True, default=False, help="Linter will ignore the fact that a given "
+                                                                       "repo is considered dirty")
+@click.option('-w', '--fatal-warnings', is_flag=True, default=False, help="Returned code will be 1 anyway, even if "
+                                                                          "there are warnings but no errors")
+@click.option('-F', '--date-from', type=click.DateTime(formats=["%Y-%m-%d"]), default=str(date.min), help="Issues introduced before this date will be ignored.")
+@click.option('-T', '--date-to', type=click.DateTime(formats=["%Y-%m-%d"]), default=str(date.today() + timedelta(days=1)), callback=_validate_date_to, help="Issues introduced after this date will be ignored.")
+@click.option('-j', '--jobs', type=click.IntRange(min=1), default=4, show_default=True,
+              help="Number of repositories checked concurrently.")
+def batch(repos_file, settings, out, fetch, allow_dirty, fatal_warnings, date_from, date_to, jobs):
+    """Evaluate many repositories (paths listed in REPOS_FILE, one per line) with the same settings"""
+    import copy
+    from concurrent.futures import ThreadPoolExecutor
+
+    try:
+        yaml_settings = yaml.load(settings, Loader=yaml.SafeLoader)
+        RulesContainer(rules=yaml_settings)
+        directories = [line.strip() for line in repos_file if line.strip() and not line.strip().startswith('#')]
+    except BaseException as err:
+        output.log.error(err)
+        return sys.exit(1)
+
+    def _lint_in_worker(git_directory: str):
+        try:
+            report = _lint(os.path.abspath(git_directory), gitflow=Gitflow(settings=yaml_settings),
+                           rules=RulesContainer(rules=copy.deepcopy(yaml_settings)), fetch=fetch,
+                           allow_dirty=allow_dirty, date_from=date_from, date_to=date_to)
+            return git_directory, report, None
+        except BaseException as err:
+            return git_directory, None, err
+
+    failed = False
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        write = output.create_batch_output(out)
+        for git_directory, report, err in write(executor.map(_lint_in_worker, directories)):
+            failed = failed or err is not None or report.contains_errors(are_warnings_errors=fatal_warnings)
+    return sys.exit(1 if failed else 0)
+
+
+@click.command()
+@click.option('--features', type=click.IntRange(min=0), default=100, show_default=True)
+@click.option('--bugfixes', type=click.IntRange(min=0), default=20, show_default=True)
+@click.option('--releases', type=click.IntRange(min=0), default=10, show_default=True)
+@click.option('--hotfixes', type=click.IntRange(min=0), default=5, show_default=True)
+@click.option('--tags', type=click.IntRange(min=0), default=15, show_default=True)
+@click.option('--depth', type=click.IntRange(min=1), default=1, show_default=True,
+              help="Number of development branches started one from another before they are merged into develop")
+@click.option('--commits', type=click.IntRange(min=1), default=3, show_default=True,
+              help="Number of commits in every development branch")
+@click.option('-r', '--repeat', type=click.IntRange(min=1), default=3, show_default=True,
+              help="Every rule is measured that many times and the best wall time is taken")
+@click.option('-s', '--settings', type=click.File(mode='r'), default=None,
+              help="Rules to measure, all built-in rules are measured by default")
+@click.option('--directory', type=click.Path(file_okay=False, dir_okay=True, writable=True), default=None,
+              help="The synthetic repository is generated (and kept) in the directory instead of a temporary one")
+@click.option('--save', type=click.Path(dir_okay=False, writable=True), default=None,
+              help="Measurements are saved to the JSON file, so they can be used as a baseline later")
+@click.option('--baseline', 'baseline_file', type=click.File(mode='r'), default=None,
+              help="Measurements are compared with the baseline and returned code is 1 if there are regressions")
+@click.option('--tolerance', type=click.FloatRange(min=0), default=0.2, show_default=True,
+              help="Relative growth of wall time and memory that is not considered a regression")
+def bench(features, bugfixes, releases, hotfixes, tags, depth, commits, repeat, settings, directory, save,
+          baseline_file, tolerance):
+    """Measure the linter against a synthetic gitflow repository"""
+    import json
+    import tempfile
+    import time
+    from gitflow_linter import benchmark
+
+    parameters = benchmark.Parameters(features=features, bugfixes=bugfixes, releases=releases, hotfixes=hotfixes,
+                                      tags=tags, depth=depth, commits=commits)
+    yaml_settings = yaml.load(settings, Loader=yaml.SafeLoader) if settings else benchmark.DEFAULT_SETTINGS
+    RulesContainer(rules=yaml_settings)
+
+    def _print_result(rule, measurement):
+        click.echo('{:<45}{:>10.3f}s{:>8} git calls{:>10} kB RSS'.format(
+            rule, measurement.wall_time, measurement.git_calls, measurement.peak_rss_kb or '-'))
+
+    with tempfile.TemporaryDirectory(prefix='gitflow-linter-bench-') as tmp_directory:
+        directory = directory or tmp_directory
+        started = time.perf_counter()
+        git_directory = benchmark.generate(directory, parameters)
+        click.echo('Repository {} generated in {:.1f}s: {}'.format(
+            git_directory, time.perf_counter() - started, dict(parameters._asdict())))
+        results = benchmark.run(git_directory, settings=yaml_settings, repeat=repeat, on_result=_print_result)
+
+    current = benchmark.baseline(parameters, repeat=repeat, results=results)
+    if save:
+        with open(save, 'w', encoding='utf-8') as file:
+            json.dump(current, file, indent=2)
+    if not baseline_file:
+        return sys.exit(0)
+    regressions = benchmark.compare(json.load(baseline_file), current, tolerance=tolerance)
+    for regression in regressions:
+        output.log.error('❌ ' + regression)
+    if not regressions:
+        click.echo('✅ No regressions comparing to the baseline')
+    return sys.exit(1 if regressions else 0)
+
+
+def lint(repo, gitflow: Gitflow, rules: RulesContainer, *, date_from=None, date_to=None, jobs=1, concurrency=4,
+         cache=None, state=None, profile=False, profile_dir=None, on_start: callable = None,
+         on_section: callable = None, keep_sections=False):
+    """
+    Lints an already opened :class:`Repository <gitflow_linter.repository.Repository>`. The repository is not closed,
+    so references and commits it has loaded are reused by next calls, eg.::
+
+        repo = Repository(Repo('/path/to/repo'), gitflow=gitflow)
+        report = lint(repo, gitflow, rules, date_from=datetime(2021, 1, 1))
+        repo.update()  # after a fetch, only new commits are loaded
+        report = lint(repo, gitflow, rules, date_from=datetime(2021, 1, 1))
+
+    The repository must not be used by other threads during the call.
+
+    :param rules: rules to check and their arguments, the container is not modified
+    :param date_from: only issues introduced after the date are reported, the date window of the repository is used
+        if not given
+    :param date_to: only issues introduced before the date are reported, the date window of the repository is used
+        if not given
+    :param jobs: number of rules checked concurrently
+    :param concurrency: maximum number of git queries a rule runs concurrently (see :class:`AsyncRepository
+        <gitflow_linter.repository.AsyncRepository>`)
+    :param cache: :class:`cache <gitflow_linter.cache.ResultCache>` results of rules are served from and stored in
+    :param state: :class:`state <gitflow_linter.state.LintState>` of the previous call, rules checking branches one by
+        one check only branches changed since then
+    :param profile: every section will contain the :class:`profile <gitflow_linter.report.Profile>` of its rule
+    :param profile_dir: ``cProfile`` statistics of every rule are dumped to the directory
+    :param on_start: called with the report (containing only statistics) before any rule is checked
+    :param on_section: called with every section as soon as it is checked, the report does not keep sections unless
+        ``keep_sections`` is set
+    :return: report containing only issues introduced between ``date_from`` and ``date_to``
+    """
+    import copy
+    from datetime import datetime
+    from gitflow_linter.report import Report
+    from gitflow_linter.visitor import StatsRepositoryVisitor
+
+    date_from = date_from if date_from is not None else repo.date_from
+    date_to = date_to if date_to is not None else repo.date_to
+    if (date_from, date_to) != (repo.date_from, repo.date_to):
+        repo = repo.windowed(date_from, date_to)
+    period = date_from or datetime.min, date_to or datetime.max
+    rules = copy.deepcopy(rules)
+
+    report = Report(working_dir=repo.repo.working_dir, stats=repo.apply(StatsRepositoryVisitor(gitflow=gitflow)),
+                    sections=[])
+    if on_start:
+        on_start(report)
+    keep_sections = on_section is None or keep_sections
+
+    visitors = __get_all_visitors(gitflow=gitflow, rules=rules)
+    for visitor, section in _apply_visitors(repo, visitors=list(visitors.values()), rules=rules, jobs=jobs,
+                                            concurrency=concurrency, cache=cache, state=state, profile=profile,
+                                            profile_dir=profile_dir):
+        if section is not None:
+            # the section may be shared by the cache, so issues are filtered in a copy
+            section = section.in_period(*period)
+            if on_section:
+                on_section(section)
+            if keep_sections:
+                report.append(section)
+        else:
+            output.log.warning('⚠️ Rule {} checked but result was not returned'.format(visitor.rule))
+        rules.consume(visitor.rule)
+
+    if rules.rules:
+        output.log.warning('Some of rules cannot be validated because corresponding validators could not be found: '
+                           + ', '.join(rules.rules))
+    return report
+
+
+async def lint_async(repo, gitflow: Gitflow, rules: RulesContainer, *, date_from=None, date_to=None, executor=None,
+                     **kwargs):
+    """
+    Lints an already opened repository in the executor (the default one of the event loop if not given), so the event
+    loop is not blocked, see :func:`lint <lint>`. Calls for the same repository must not overlap.
+
+    :return: report containing only issues introduced between ``date_from`` and ``date_to``
+    """
+    import asyncio
+    import functools
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(lint, repo, gitflow, rules, date_from=date_from,
+                                                                  date_to=date_to, **kwargs))
+
+
+def _lint_streaming(git_directory: str, gitflow: Gitflow, rules: RulesContainer, out: str, fatal_warnings: bool,
+                    date_from, date_to, **kwargs) -> int:
+    """
+    Lints the repository and writes every section as soon as it is checked, sections are not kept in memory
+
+    :return: exit code
+    """
+    writer = output.create_streaming_output(out)
+    failed = False
+
+    def _on_section(section):
+        nonlocal failed
+        failed = failed or section.contains_errors or (fatal_warnings and section.contains_warns)
+        writer.section(section)
+
+    _lint(git_directory, gitflow=gitflow, rules=rules, date_from=date_from, date_to=date_to, on_start=writer.start,
+          on_section=_on_section, **kwargs)
+    return 1 if failed else 0
+
+
+def _watch(git_directory: str, yaml_settings: dict, fetch: bool, allow_dirty: bool, date_from, date_to, jobs: int,
+           port: int, interval: float, fetch_interval=None) -> int:
+    """
+    Lints the repository again whenever its references change until interrupted, the latest report is served by
+    a local HTTP server
+
+    :return: exit code
+    """
+    import copy
+    import threading
+    from gitflow_linter import watch
+    from gitflow_linter.repository import Repository
+
+    gitflow = Gitflow(settings=yaml_settings)
+    RulesContainer(rules=copy.deepcopy(yaml_settings))
+    if date_to.date() == date.today() + timedelta(days=1):
+        # the default date is not moved while watching, so new issues would be ignored from tomorrow on
+        date_to = None
+    repo = Repository(Repo(git_directory), gitflow=gitflow, should_fetch=fetch, allow_dirty=allow_dirty,
+                      date_from=date_from, date_to=date_to)
+    watcher = watch.Watcher(repo, gitflow=gitflow, settings=yaml_settings, jobs=jobs, fetch_interval=fetch_interval)
+    server = watch.serve(watcher, port=port)
+    output.log.info('👀 Watching {}, the latest report is served on http://{}:{}/'.format(
+        git_directory, *server.server_address[:2]))
+
+    def _on_report(report):
+        output.log.info('{} Report updated: {} rules checked'.format(
+            '❌' if report.contains_errors(are_warnings_errors=False) else '✅', len(report.sections)))
+
+    try:
+        watcher.watch(interval=interval, stop=threading.Event(), on_report=_on_report)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        repo.close()
+    return 0
+
+
+def _lint(git_directory: str, gitflow: Gitflow, rules: RulesContainer, fetch=False, allow_dirty=False, jobs=1,
+          cache=False, since_state=None, profile=False, profile_dir=None, date_from=None, date_to=None,
+          on_start: callable = None, on_section: callable = None):
+    """
+    Opens the repository, lints it by :func:`lint <lint>` and closes it. If ``on_section`` is given, every section is
+    passed to it as soon as it is checked and the report does not keep sections (unless they have to be recorded by
+    ``since_state``). If ``date_from`` or ``date_to`` is given, visitors skip branches and commits out of the window and
+    only issues introduced in the window are reported.
+    """
+    from gitflow_linter.repository import Repository
+
+    repo = Repository(Repo(git_directory), gitflow=gitflow, should_fetch=fetch, allow_dirty=allow_dirty,
+                      date_from=date_from, date_to=date_to)
+    try:
+        result_cache = None
+        if cache:
+            from gitflow_linter.cache import ResultCache, CACHE_DIR_NAME
+            result_cache = ResultCache(directory=os.path.join(repo.repo.git_dir, CACHE_DIR_NAME))
+
+        lint_state = None
+        if since_state:
+            from gitflow_linter.state import LintState
+            lint_state = LintState.load(since_state)
+
+        rules_args = {rule: rules.args_for(rule) for rule in rules.rules}
+        report = lint(repo, gitflow=gitflow, rules=rules, jobs=jobs, cache=result_cache, state=lint_state,
+                      profile=profile, profile_dir=profile_dir, on_start=on_start, on_section=on_section,
+                      keep_sections=bool(since_state))
+        if result_cache:
+            result_cache.evict()
+        if since_state:
+            from gitflow_linter.state import LintState
+            try:
+                LintState(created=date.today().isoformat(), refs=repo.ref_state(), args=rules_args,
+                          report=report, window=LintState.window_of(repo)).save(since_state)
+            except OSError as err:
+                # the report is still valid, only the next run will check all branches
+                output.log.warning('⚠️ State cannot be recorded in {}: {}'.format(since_state, err))
+        return report
+    finally:
+        repo.close()
+
+
+def _apply_visitor(repo, visitor, kwargs: dict, cache=None, state=None, concurrency=4):
+    from gitflow_linter.report import Section, Issue, Level
+
+    try:
+        fingerprint = cache.fingerprint(repo, visitor, kwargs) if cache else None
+        cached_section = cache.get(fingerprint) if fingerprint else None
+        if cached_section is not None:
+            return cached_section
+
+        scope = state.scope(repo, visitor, kwargs) if state else None
+        if scope is not None and not scope:
+            return state.previous_section(visitor.rule)
+
+        view = repo.scoped(scope) if scope is not None else repo
+        section: Section = _visit(view, visitor, kwargs if kwargs else {}, concurrency=concurrency)
+        if section is not None and kwargs and kwargs.get('severity', None):
+            if kwargs['severity'].lower() in list(Level):
+                section.change_severity(to=Level(kwargs['severity'].lower()))
+            else:
+                output.log.warning('Provided severity "{}" is not recognized. Allowed values: [{}]'.format(
+                    kwargs['severity'], ', '.join(list(Level))))
+        if section is not None and scope is not None:
+            section = state.merge(visitor.rule, section, scope=scope)
+        if section is not None and fingerprint:
+            cache.put(fingerprint, section)
+        return section
+    except BaseException as err:
+        error_section = Section(rule=visitor.rule, title='ERROR!')
+        error_section.append(Issue.error('💀 Cannot be checked because of error: {err}'.format(err=err)))
+        return error_section
+
+
+def _visit(repo, visitor, kwargs: dict, concurrency: int):
+    """
+    Visitors overriding :meth:`BaseVisitor.visit_async <gitflow_linter.visitor.BaseVisitor.visit_async>` run their git
+    queries concurrently in an event loop of their own, unless the thread already runs one
+    """
+    import asyncio
+    from gitflow_linter.repository import AsyncRepository
+    from gitflow_linter.visitor import BaseVisitor
+
+    if not isinstance(visitor, BaseVisitor) or type(visitor).visit_async is BaseVisitor.visit_async:
+        return repo.apply(visitor, **kwargs)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(AsyncRepository(repo, concurrency=concurrency).apply(visitor, **kwargs))
+    return repo.apply(visitor, **kwargs)
+
+
+def _apply_profiled(repo, visitor, kwargs: dict, cache=None, state=None, concurrency=4, profile_dir=None):
+    from gitflow_linter import profiling
+
+    dump_path = os.path.join(profile_dir, '{}.pstats'.format(visitor.rule)) if profile_dir else None
+    with profiling.profiled(dump_path=dump_path) as measured:
+        section = _apply_visitor(repo, visitor, kwargs, cache=cache, state=state, concurrency=concurrency)
+    if section is not None:
+        section.profile = measured.profile
+    return section
+
+
+def _apply_visitors(repo, visitors: list, rules: RulesContainer, jobs: int = 1, concurrency=4, cache=None,
+                    state=None, profile=False, profile_dir=None):
+    """
+    Lets visitors visit the repository and yields ``(visitor, section)`` pairs in the order of given visitors.
+    If ``jobs`` is greater than 1, visitors are applied concurrently and each worker thread uses its own fork of the
+    repository. If ``cache`` is given, results of visitors are served from it whenever possible. If ``state`` of the
+    previous run is given, rules checking branches one by one are checked only for branches changed since then.
+    If ``profile`` is set, resources used by every visitor are measured (and dumped to ``profile_dir`` if given).
+    """
+    import functools
+    apply = functools.partial(_apply_profiled, profile_dir=profile_dir) if profile or profile_dir else _apply_visitor
+    apply = functools.partial(apply, concurrency=concurrency)
+    kwargs = [rules.args_for(visitor.rule) for visitor in visitors]
+    if jobs <= 1 or len(visitors) <= 1:
+        for visitor, visitor_kwargs in zip(visitors, kwargs):
+            yield visitor, apply(repo, visitor, visitor_kwargs, cache=cache, state=state)
+        return
+
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    local = threading.local()
+    forks = []
+    forks_lock = threading.Lock()
+
+    def _apply_in_worker(visitor, visitor_kwargs):
+        if not hasattr(local, 'repo'):
+            local.repo = repo.fork()
+            with forks_lock:
+                forks.append(local.repo)
+        return apply(local.repo, visitor, visitor_kwargs, cache=cache, state=state)
+
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            yield from zip(visitors, executor.map(_apply_in_worker, visitors, kwargs))
+    finally:
+        # workers have finished, so their git processes can be stopped
+        for fork in forks:
+            fork.close()
+
+
 def parse_yaml(settings):
     yaml_settings = yaml.load(settings, Loader=yaml.SafeLoader)
     gitflow = Gitflow(settings=yaml_settings)
@@ -104,10 +517,10 @@ def parse_yaml(settings):
 def __get_all_visitors(gitflow: Gitflow, rules: RulesContainer) -> dict:
     from gitflow_linter import visitor
     from gitflow_linter import plugins
-    visitors = [visitor for visitor in visitor.visitors(gitflow=gitflow) if visitor.rule in rules.rules]
+    built_in = visitor.visitors(gitflow=gitflow)
+    visitors = [visitor for visitor in built_in if visitor.rule in rules.rules]
     plugin_visitors = [plugin.visitors(gitflow=gitflow)
-                       for plugin in plugins.discovered_plugins.values()
-                       if plugins.is_plugin_valid(plugin_module=plugin)]
+                       for plugin in plugins.plugins_for(rules.rules, handled=[v.rule for v in built_in])]
     flatten = lambda t: [item for sublist in t for item in sublist]
     all_visitors = visitors + [plugin_visitor
                                for plugin_visitor in flatten(plugin_visitors)
@@ -121,14 +534,14 @@ def __get_all_visitors(gitflow: Gitflow, rules: RulesContainer) -> dict:
 @click.command()
 def available_plugins():
     from gitflow_linter import plugins
-    available_plugins = plugins.discovered_plugins.keys()
+    available_plugins = plugins.discover().keys()
     output.stdout_log.info('Available gitflow-linter plugins:')
     if not available_plugins:
         output.stdout_log.info('No plugins found.')
     for plugin in available_plugins:
         try:
-            plugins.validate_plugin(plugin_module=plugins.discovered_plugins[plugin])
-            plugin_visitors = plugins.discovered_plugins[plugin].visitors(gitflow={})
+            plugins.validate_plugin(plugin_module=plugins.load(plugin))
+            plugin_visitors = plugins.load(plugin).visitors(gitflow={})
             log_fmt = '- {} handles following rules: ' + os.linesep + '\t* {}'
             output.stdout_log.info(log_fmt.format(plugin, '\t* '.join([v.rule for v in plugin_visitors])))
         except BaseException as err:
@@ -0,0 +1,270 @@
+"""
+Benchmark of the linter against synthetic gitflow repositories, run by ``gitflow-linter-bench`` command.
+
+A local bare repository plays the role of the remote, it is filled with ``git fast-import`` and cloned, so the
+benchmark does not need network. Every rule (and statistics) is measured in a separate process, with a fresh
+:class:`Repository <gitflow_linter.repository.Repository>`, so measurements do not depend on each other.
+"""
+import os
+import platform
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Dict, List, NamedTuple, Optional
+
+from git import Git, Repo
+
+STATS = 'statistics'
+TOTAL = 'total'
+
+DEFAULT_SETTINGS = {
+    'rules': {
+        'single_master_and_develop': {},
+        'no_old_development_branches': {'max_days_features': 50},
+        'no_orphan_branches': {},
+        'master_must_have_tags': {},
+        'no_direct_commits_to_protected_branches': {},
+        'version_names_follow_convention': {'version_regex': r'^\d+\.\d+(\.\d+)?$'},
+        'dev_branch_names_follow_convention': {'name_regex': r'^\d+-[\.a-zA-Z0-9_-]+?$'},
+        'no_dead_releases': {'deadline_to_close_release': 30},
+        'no_dependant_features': {'max_dependant_branches': 0},
+    }
+}
+
+
+class Parameters(NamedTuple):
+    """
+    Shape of a synthetic repository. Every ``depth`` consecutive development branches form a chain: each of them is
+    started from the previous one and they are merged into develop one by one. Every 5th development branch is left
+    open (not merged).
+    """
+    features: int = 100
+    bugfixes: int = 20
+    releases: int = 10
+    hotfixes: int = 5
+    tags: int = 15
+    depth: int = 1
+    commits: int = 3
+
+
+class Measurement(NamedTuple):
+    wall_time: float
+    git_calls: int
+    peak_rss_kb: Optional[int]
+    peak_git_rss_kb: Optional[int]
+    issues: int
+
+
+class _Commit(NamedTuple):
+    ref: str
+    mark: int
+    parents: tuple
+    message: str
+
+
+def generate(directory: str, parameters: Parameters) -> str:
+    """
+    Creates a bare repository ``remote.git`` filled with synthetic gitflow history and its clone ``work`` in given
+    directory.
+
+    :return: path of the clone
+    """
+    remote_dir, work_dir = os.path.join(directory, 'remote.git'), os.path.join(directory, 'work')
+    remote = Repo.init(remote_dir, bare=True)
+    remote.git.symbolic_ref('HEAD', 'refs/heads/master')
+    commits, tags = _history(parameters)
+    subprocess.run(['git', 'fast-import', '--quiet'], cwd=remote_dir, check=True,
+                   input=_fast_import_stream(commits, tags, now=int(time.time())))
+    remote.close()
+
+    work = Repo.clone_from(remote_dir, work_dir)
+    work.git.checkout('develop')
+    work.git.checkout('master')
+    work.close()
+    return work_dir
+
+
+def _history(parameters: Parameters):
+    commits: List[_Commit] = []
+    tips: Dict[str, int] = dict()
+    master_merges: List[tuple] = []
+    develop_merges: List[int] = []
+
+    def commit(ref: str, message: str, *parents: int) -> int:
+        commits.append(_Commit(ref=ref, mark=len(commits) + 1, parents=parents, message=message))
+        tips[ref] = len(commits)
+        return len(commits)
+
+    def merge(source: str, target: str) -> int:
+        return commit(target, 'Merge branch {} into {}'.format(source, target), tips[target], tips[source])
+
+    commit('master', 'Initial commit')
+    tips['develop'] = tips['master']
+
+    dev_branches = ['feature/{}-synthetic'.format(i) for i in range(parameters.features)] + \
+                   ['bugfix/{}-synthetic'.format(i) for i in range(parameters.bugfixes)]
+    cycles = max(parameters.releases, 1)
+    per_cycle = -(-len(dev_branches) // cycles) if dev_branches else 0
+    hotfixes = list(range(parameters.hotfixes))
+    for cycle in range(cycles):
+        for index, branch in enumerate(dev_branches[cycle * per_cycle:(cycle + 1) * per_cycle],
+                                       start=cycle * per_cycle):
+            chained = parameters.depth > 1 and index % parameters.depth != 0
+            start = tips[dev_branches[index - 1]] if chained else tips['develop']
+            for number in range(parameters.commits):
+                commit(branch, '{} commit {}'.format(branch, number), tips[branch] if number else start)
+            if index % 5 != 4:
+                develop_merges.append(merge(branch, 'develop'))
+        if cycle >= parameters.releases:
+            continue
+
+        release = 'release/{}.0'.format(cycle + 1)
+        commit(release, 'Bump version to {}.0'.format(cycle + 1), tips['develop'])
+        master_merges.append(('{}.0.0'.format(cycle + 1), merge(release, 'master')))
+        merge(release, 'develop')
+        for patch, _ in enumerate(hotfixes[cycle::cycles], start=1):
+            name = 'hotfix/{}.0.{}'.format(cycle + 1, patch)
+            commit(name, 'Fix {}'.format(name), tips['master'])
+            master_merges.append(('{}.0.{}'.format(cycle + 1, patch), merge(name, 'master')))
+            merge(name, 'develop')
+
+    # the newest commits of master are tagged, tags that are left are put on merges into develop
+    tags = master_merges[::-1][:parameters.tags]
+    tags += [('build-{}'.format(number), mark)
+             for number, mark in enumerate(develop_merges[::-1][:max(parameters.tags - len(tags), 0)])]
+    return commits, tags
+
+
+def _fast_import_stream(commits: List[_Commit], tags: List[tuple], now: int) -> bytes:
+    def data(text: str) -> str:
+        return 'data {}\n{}\n'.format(len(text.encode('utf-8')), text)
+
+    # commits are spread evenly over the last year, so some of branches are old
+    step = 365 * 24 * 3600 // max(len(commits), 1)
+    stream = []
+    for commit in commits:
+        timestamp = now - (len(commits) - commit.mark) * step
+        stream.append('commit refs/heads/{}\nmark :{}\n'.format(commit.ref, commit.mark))
+        stream.append('committer Benchmark <benchmark@example.com> {} +0000\n'.format(timestamp))
+        stream.append(data(commit.message))
+        if commit.parents:
+            stream.append('from :{}\n'.format(commit.parents[0]))
+        for parent in commit.parents[1:]:
+            stream.append('merge :{}\n'.format(parent))
+        stream.append('M 100644 inline {}.txt\n'.format(commit.ref.replace('/', '_')))
+        stream.append(data(commit.message))
+    for name, mark in tags:
+        if name.startswith('build-'):
+            stream.append('reset refs/tags/{}\nfrom :{}\n'.format(name, mark))
+        else:
+            stream.append('tag {}\nfrom :{}\n'.format(name, mark))
+            stream.append('tagger Benchmark <benchmark@example.com> {} +0000\n'.format(now))
+            stream.append(data('Version {}'.format(name)))
+    return ''.join(stream).encode('utf-8')
+
+
+def _peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None, None
+    # kilobytes on Linux, bytes on macOS
+    scale = 1024 if platform.system() == 'Darwin' else 1
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale, \
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale
+
+
+def _measure(git_directory: str, settings: dict, rule: str, repeat: int) -> Measurement:
+    """
+    Measures a rule (or statistics, or a whole run of the linter) in the current process
+    """
+    import copy
+    from gitflow_linter import _lint, _apply_visitor, profiling
+    from gitflow_linter import visitor as visitors
+    from gitflow_linter.repository import Repository
+    from gitflow_linter.rules import Gitflow, RulesContainer
+
+    gitflow = Gitflow(settings=settings)
+    rules = RulesContainer(rules=copy.deepcopy(settings))
+    profiles, issues = [], 0
+    for _ in range(repeat):
+        if rule == TOTAL:
+            with profiling.profiled() as measured:
+                report = _lint(git_directory, gitflow=gitflow, rules=RulesContainer(rules=copy.deepcopy(settings)))
+            issues = sum(len(section.issues) for section in report.sections)
+        else:
+            repo = Repository(Repo(git_directory), gitflow=gitflow)
+            visitor = visitors.StatsRepositoryVisitor(gitflow=gitflow) if rule == STATS else \
+                next(v for v in visitors.visitors(gitflow=gitflow) if v.rule == rule)
+            try:
+                with profiling.profiled() as measured:
+                    result = repo.apply(visitor) if rule == STATS else \
+                        _apply_visitor(repo, visitor, rules.args_for(rule))
+            finally:
+                repo.close()
+            issues = len(result.issues) if rule != STATS else 0
+        profiles.append(measured.profile)
+    peak_rss_kb, peak_git_rss_kb = _peak_rss_kb()
+    return Measurement(wall_time=min(profile.wall_time for profile in profiles), git_calls=profiles[0].git_calls,
+                       peak_rss_kb=peak_rss_kb, peak_git_rss_kb=peak_git_rss_kb, issues=issues)
+
+
+def run(git_directory: str, settings: dict, repeat: int = 3, on_result: callable = None) -> Dict[str, Measurement]:
+    """
+    Measures statistics, every built-in rule given in settings and the whole run of the linter. Each of them is measured
+    in a new process, the best wall time of ``repeat`` runs is taken.
+
+    :return: measurements by rule (``statistics`` and ``total`` included)
+    """
+    from gitflow_linter import visitor as visitors
+    from gitflow_linter.rules import Gitflow
+
+    rules = [v.rule for v in visitors.visitors(gitflow=Gitflow(settings=settings)) if v.rule in settings['rules']]
+    results = dict()
+    for rule in [STATS] + rules + [TOTAL]:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+            results[rule] = executor.submit(_measure, git_directory, settings, rule, repeat).result()
+        if on_result:
+            on_result(rule, results[rule])
+    return results
+
+
+def baseline(parameters: Parameters, repeat: int, results: Dict[str, Measurement]) -> dict:
+    from gitflow_linter import __version__
+    return {
+        'version': __version__,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'git': '.'.join(str(part) for part in Git().version_info),
+        'parameters': parameters._asdict(),
+        'repeat': repeat,
+        'results': {rule: measurement._asdict() for rule, measurement in results.items()},
+    }
+
+
+def compare(previous: dict, current: dict, tolerance: float, min_seconds: float = 0.05) -> List[str]:
+    """
+    :param tolerance: relative growth of wall time and peak memory that is not considered a regression, eg. ``0.2``
+    :param min_seconds: growth of wall time that is considered a noise anyway
+    :return: descriptions of regressions of ``current`` baseline comparing to the ``previous`` one
+    """
+    regressions = []
+    if previous.get('parameters') != current.get('parameters'):
+        regressions.append('Baselines were recorded for different repositories: {} vs {}'.format(
+            previous.get('parameters'), current.get('parameters')))
+        return regressions
+    for rule, now in current['results'].items():
+        before = previous['results'].get(rule, None)
+        if not before:
+            continue
+        if now['wall_time'] > before['wall_time'] * (1 + tolerance) and \
+                now['wall_time'] - before['wall_time'] > min_seconds:
+            regressions.append('{}: wall time {:.3f}s -> {:.3f}s'.format(rule, before['wall_time'], now['wall_time']))
+        if now['git_calls'] > before['git_calls']:
+            regressions.append('{}: git calls {} -> {}'.format(rule, before['git_calls'], now['git_calls']))
+        if now['peak_rss_kb'] and before['peak_rss_kb'] and \
+                now['peak_rss_kb'] > before['peak_rss_kb'] * (1 + tolerance):
+            regressions.append('{}: peak RSS {}kB -> {}kB'.format(rule, before['peak_rss_kb'], now['peak_rss_kb']))
+    return regressions
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import time
+from datetime import date, timedelta
+from typing import Optional
+
+from gitflow_linter import output
+from gitflow_linter.report import Section
+from gitflow_linter.repository import Repository
+
+CACHE_DIR_NAME = 'gitflow-linter-cache'
+
+
+class ResultCache:
+    """
+    Opt-in on-disk cache of rule results.
+
+    Each :class:`Section <gitflow_linter.report.Section>` is stored together with a fingerprint of everything it
+    depends on: SHAs of references declared by :meth:`BaseVisitor.dependencies
+    <gitflow_linter.visitor.BaseVisitor.dependencies>`, arguments of the rule, gitflow settings, the date window and
+    the current date (so time based rules like ``no_old_development_branches`` are evaluated again at least once a
+    day).
+    Entries older than ``max_age`` are evicted first, then the least recently used ones until the cache fits in
+    ``max_size`` bytes.
+    Failures of the cache (eg. a read-only directory or a full disk) are logged and never change results of rules.
+    """
+
+    def __init__(self, directory: str, max_age: timedelta = timedelta(days=7), max_size: int = 50 * 1024 * 1024):
+        self.directory = directory
+        self.max_age = max_age
+        self.max_size = max_size
+        self._warned = False
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as err:
+            self._warn(err)
+
+    def fingerprint(self, repo: Repository, visitor, kwargs: dict) -> Optional[str]:
+        """
+        :return: fingerprint of inputs the visitor depends on or ``None`` if the visitor cannot be cached
+        """
+        from gitflow_linter import __version__
+        dependencies = visitor.dependencies(repo)
+        if dependencies is None:
+            return None
+        refs = sorted((name, sha) for name, sha in repo.ref_state().items()
+                      if any(name.startswith(prefix) for prefix in dependencies))
+        payload = json.dumps({
+            'version': __version__,
+            'visitor': '.'.join([type(visitor).__module__, type(visitor).__qualname__]),
+            'rule': visitor.rule,
+            'gitflow': visitor.gitflow,
+            'args': kwargs,
+            'refs': refs,
+            'window': [repo.date_from, repo.date_to],
+            'date': date.today().isoformat(),
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, fingerprint: str) -> Optional[Section]:
+        path = self._path(fingerprint)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                section = Section.from_dict(json.load(file))
+        except (OSError, ValueError, KeyError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            # the entry has been evicted in the meantime or the directory is read-only, it is used anyway
+            pass
+        return section
+
+    def put(self, fingerprint: str, section: Section):
+        path = self._path(fingerprint)
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump(section.to_dict(), file)
+            os.replace(tmp_path, path)
+        except OSError as err:
+            self._warn(err)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def evict(self):
+        """
+        Removes entries older than ``max_age`` and then the least recently used ones exceeding ``max_size``
+        """
+        deadline = time.time() - self.max_age.total_seconds()
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError as err:
+            self._warn(err)
+            return
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+                if stat.st_mtime < deadline:
+                    os.remove(path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                continue
+
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            size -= entry_size
+
+    def _warn(self, err: OSError):
+        if not self._warned:
+            self._warned = True
+            output.log.warning('⚠️ Results of rules cannot be cached in {}: {}'.format(self.directory, err))
+
+    def _path(self, fingerprint: str) -> str:
+        return os.path.join(self.directory, fingerprint + '.json')
+
+
+class MemoryResultCache(ResultCache):
+    """
+    Cache of rule results kept in memory by ``--watch`` mode, see :class:`ResultCache <ResultCache>`.
+    Sections are kept as they are (not serialized), entries not used since the previous eviction are evicted.
+    """
+
+    def __init__(self):
+        self._sections = dict()
+        self._used = set()
+
+    def get(self, fingerprint: str) -> Optional[Section]:
+        section = self._sections.get(fingerprint, None)
+        if section is not None:
+            self._used.add(fingerprint)
+        return section
+
+    def put(self, fingerprint: str, section: Section):
+        self._sections[fingerprint] = section
+        self._used.add(fingerprint)
+
+    def evict(self):
+        self._sections = {fingerprint: section for fingerprint, section in self._sections.items()
+                          if fingerprint in self._used}
+        self._used = set()
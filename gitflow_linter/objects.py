@@ -0,0 +1,140 @@
+import subprocess
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from git import Git, GitCommandError
+
+from gitflow_linter import profiling
+
+
+def tz_offset(tz: str) -> int:
+    """
+    :param tz: timezone of a git date, eg. ``+0530``
+    :return: offset from UTC in seconds
+    """
+    sign = -1 if tz.startswith('-') else 1
+    return sign * (int(tz[1:3]) * 3600 + int(tz[3:5]) * 60)
+
+
+class ObjectHeader(NamedTuple):
+    sha: str
+    type: str
+    size: int
+
+
+class CommitData(NamedTuple):
+    """
+    Commit parsed from ``git cat-file --batch`` output. It exposes the same basic attributes as GitPython's ``Commit``
+    (``hexsha``, ``summary``, ``message``, ``committed_datetime``), so it can be used as an object related to an
+    :class:`Issue <gitflow_linter.report.Issue>`
+    """
+    hexsha: str
+    parents: Tuple[str, ...]
+    committed_date: int
+    committer_tz_offset: int
+    message: str
+
+    @property
+    def summary(self) -> str:
+        return self.message.split('\n', 1)[0]
+
+    @property
+    def committed_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.committed_date, timezone(timedelta(seconds=self.committer_tz_offset)))
+
+    @classmethod
+    def parse(cls, sha: str, data: bytes) -> 'CommitData':
+        headers, _, message = data.decode('utf-8', errors='replace').partition('\n\n')
+        parents = []
+        committed_date, committer_tz_offset = 0, 0
+        for header in headers.split('\n'):
+            key, _, value = header.partition(' ')
+            if key == 'parent':
+                parents.append(value)
+            elif key == 'committer':
+                timestamp, tz = value.rsplit(' ', 2)[-2:]
+                committed_date = int(timestamp)
+                committer_tz_offset = tz_offset(tz)
+        return cls(hexsha=sha, parents=tuple(parents), committed_date=committed_date,
+                   committer_tz_offset=committer_tz_offset, message=message)
+
+
+class ObjectReader:
+    """
+    Long-lived ``git cat-file --batch`` process owned by a :class:`Repository <gitflow_linter.repository.Repository>`
+    and shared by all visitors.
+
+    Objects are requested in batches, so resolving hundreds of objects costs no process start-up at all.
+    """
+
+    # requests sent at once fit in a pipe on any platform, so writing them never waits for git output to be read
+    _CHUNK_SIZE = 4096
+
+    def __init__(self, git: Git):
+        self._git = git
+        self._batch = None
+        self._lock = threading.Lock()
+
+    def read(self, revs: Iterable[str]) -> Dict[str, Optional[Tuple[ObjectHeader, bytes]]]:
+        """
+        :param revs: SHAs or other revisions, eg. ``origin/develop``, ``1.0.0^{commit}``
+        :return: header and raw content of every object, ``None`` if it does not exist
+        """
+        result = {}
+        with self._lock:
+            if self._batch is None:
+                self._batch = self._start('--batch')
+            for chunk in self._chunks(dict.fromkeys(revs)):
+                self._batch.stdin.write(b''.join(request for _, request in chunk))
+                self._batch.stdin.flush()
+                for rev, _ in chunk:
+                    header = self._read_header(self._batch)
+                    result[rev] = (header, self._batch.stdout.read(header.size + 1)[:-1]) if header else None
+        return result
+
+    def commits(self, revs: Iterable[str]) -> Dict[str, Optional[CommitData]]:
+        """
+        :param revs: SHAs of commits or other revisions pointing to commits
+        :return: parsed commits, ``None`` if a revision does not point to a commit
+        """
+        commits = {
+            rev: CommitData.parse(obj[0].sha, obj[1]) if obj and obj[0].type == 'commit' else None
+            for rev, obj in self.read(revs).items()
+        }
+        profiling.count(profiling.COMMITS, len([commit for commit in commits.values() if commit]))
+        return commits
+
+    def close(self):
+        with self._lock:
+            if self._batch is not None:
+                self._batch.stdin.close()
+                try:
+                    self._batch.wait()
+                except GitCommandError:
+                    # the process has been killed already, eg. by Ctrl+C sent to the whole process group
+                    pass
+            self._batch = None
+
+    @classmethod
+    def _chunks(cls, revs: Iterable[str]) -> Iterator[List[Tuple[str, bytes]]]:
+        chunk, size = [], 0
+        for rev in revs:
+            request = (rev + '\n').encode('utf-8')
+            if chunk and size + len(request) > cls._CHUNK_SIZE:
+                yield chunk
+                chunk, size = [], 0
+            chunk.append((rev, request))
+            size += len(request)
+        if chunk:
+            yield chunk
+
+    def _start(self, mode: str):
+        return self._git.cat_file(mode, as_process=True, istream=subprocess.PIPE)
+
+    @staticmethod
+    def _read_header(process) -> Optional[ObjectHeader]:
+        fields = process.stdout.readline().decode('utf-8').split()
+        if len(fields) != 3:
+            return None
+        return ObjectHeader(sha=fields[0], type=fields[1], size=int(fields[2]))
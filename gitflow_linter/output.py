@@ -2,6 +2,7 @@ import logging
 import os
 import sys
 from os import linesep
+from typing import Iterable, Iterator, Optional
 from gitflow_linter.report import Report, Section
 
 FORMAT = '%(message)s'
@@ -35,30 +36,108 @@ def _console_output(report: Report):
     for section in report.sections:
         log.info(linesep + _section_icon(section) + '\t' + section.rule)
         log.info('\t' + section.title)
+        if section.profile:
+            log.info('\tProfile: {}'.format(section.profile))
         if section.issues:
             log.info('\tIssues detected:')
             for issue in section.issues:
                 log.log(issue.level.to_log_level, '\t\t- ' + issue.description)
 
 
-def _json_output(report: Report):
-    import json
-    stdout_log.info(json.dumps({
+def _section_to_dict(section: Section) -> dict:
+    record = {
+        'rule': section.rule,
+        'title': section.title,
+        'issues': [
+            {
+                'level': issue.level,
+                'description': issue.description,
+            } for issue in section.issues
+        ]
+    }
+    if section.profile:
+        record['profile'] = section.profile.to_dict()
+    return record
+
+
+def _report_to_dict(report: Report) -> dict:
+    return {
         'repository': report.working_dir,
         'statistics': report.stats,
-        'sections': [
-            {
+        'sections': [_section_to_dict(section) for section in report.sections]
+    }
+
+
+def _json_output(report: Report):
+    import json
+    stdout_log.info(json.dumps(_report_to_dict(report), indent=2))
+
+
+def _batch_record(git_directory: str, report: Optional[Report], err: Optional[BaseException]) -> dict:
+    if err is not None:
+        return {'repository': git_directory, 'error': str(err)}
+    return _report_to_dict(report)
+
+
+def _console_batch_output(results: Iterable[tuple]) -> Iterator[tuple]:
+    for git_directory, report, err in results:
+        if err is not None:
+            log.error('❌ {} cannot be checked because of error: {}'.format(git_directory, err))
+        else:
+            _console_output(report)
+        yield git_directory, report, err
+
+
+def _ndjson_batch_output(results: Iterable[tuple]) -> Iterator[tuple]:
+    import json
+    for result in results:
+        stdout_log.info(json.dumps(_batch_record(*result)))
+        yield result
+
+
+def _json_batch_output(results: Iterable[tuple]) -> Iterator[tuple]:
+    import json
+    records = []
+    for result in results:
+        records.append(_batch_record(*result))
+        yield result
+    stdout_log.info(json.dumps({'repositories': records}, indent=2))
+
+
+class _NdjsonOutput:
+    """
+    Writes a record per line as soon as it is known: the report header first, then every section followed by its
+    issues
+    """
+
+    def start(self, report: Report):
+        self._write({
+            'type': 'report',
+            'repository': report.working_dir,
+            'statistics': report.stats,
+        })
+
+    def section(self, section: Section):
+        record = {
+            'type': 'section',
+            'rule': section.rule,
+            'title': section.title,
+        }
+        if section.profile:
+            record['profile'] = section.profile.to_dict()
+        self._write(record)
+        for issue in section.issues:
+            self._write({
+                'type': 'issue',
                 'rule': section.rule,
-                'title': section.title,
-                'issues': [
-                    {
-                        'level': issue.level,
-                        'description': issue.description,
-                    } for issue in section.issues
-                ]
-            } for section in report.sections
-        ]
-    }, indent=2))
+                'level': issue.level,
+                'description': issue.description,
+            })
+
+    @staticmethod
+    def _write(record: dict):
+        import json
+        stdout_log.info(json.dumps(record))
 
 
 outputs = {
@@ -66,6 +145,32 @@ outputs = {
     'json': _json_output,
 }
 
+streaming_outputs = {
+    'ndjson': _NdjsonOutput,
+}
+
+batch_outputs = {
+    'console': _console_batch_output,
+    'json': _json_batch_output,
+    'ndjson': _ndjson_batch_output,
+}
+
 
 def create_output(out_type) -> callable:
     return outputs.get(out_type, _console_output)
+
+
+def create_streaming_output(out_type):
+    """
+    :return: output with ``start(report)`` and ``section(section)`` methods, called as soon as the report is started
+        and every section is checked
+    """
+    return streaming_outputs.get(out_type, _NdjsonOutput)()
+
+
+def create_batch_output(out_type) -> callable:
+    """
+    :return: callable that writes results of ``gitflow-linter-batch`` given as ``(git_directory, report, error)``
+        tuples and yields them back once written
+    """
+    return batch_outputs.get(out_type, _console_batch_output)
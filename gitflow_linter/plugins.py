@@ -1,12 +1,74 @@
 import importlib
+import importlib.util
+import json
+import os
 import pkgutil
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 
-discovered_plugins = {
-    name: importlib.import_module(name)
-    for finder, name, ispkg
-    in pkgutil.iter_modules()
-    if name.startswith('gitflow_') and name.endswith('_linter') and name != 'gitflow_linter'
-}
+ENTRY_POINT_GROUP = 'gitflow_linter.plugins'
+
+_CACHE_FILE = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+                           'gitflow-linter', 'plugins.json')
+
+
+@lru_cache(maxsize=None)
+def discover() -> Dict[str, str]:
+    """
+    Finds plugins without importing them. A plugin is either registered as an entry point in ``gitflow_linter.plugins``
+    group or it is an installed module named ``gitflow_{name}_linter``. Found plugins are cached between runs until
+    any directory of ``sys.path`` changes (eg. a package is installed or removed), so the path is not scanned again.
+
+    :return: names of plugins mapped to their modules
+    """
+    return {name: value.split(':')[0].strip() for name, (value, _) in _plugins().items()}
+
+
+@lru_cache(maxsize=None)
+def load(name: str):
+    """
+    Imports the plugin
+    """
+    from importlib import metadata
+    value, _ = _plugins()[name]
+    return metadata.EntryPoint(name, value, ENTRY_POINT_GROUP).load()
+
+
+def plugins_for(rules: Iterable[str], handled: Iterable[str] = ()) -> list:
+    """
+    Imports only plugins that handle any of given rules. Rules handled by plugins are cached between runs (until
+    version of a plugin's distribution or any module of the plugin changes), so plugins are imported only once to find
+    out what they handle. If any rule is handled neither by ``handled`` rules nor by any cached plugin, plugins are
+    imported again to find out what they handle now.
+
+    :param handled: rules handled without plugins, eg. by built-in visitors
+    :return: imported, valid plugins handling given rules
+    """
+    rules = set(rules)
+    plugins = discover()
+    data = _read_cache()
+    cached = data.get('rules', {})
+    keys = {name: _cache_key(name) for name in plugins}
+    cache = {key: cached[key] for key in keys.values() if key in cached}
+    loaded = dict()
+
+    def _load(name: str):
+        loaded[name] = _load_valid(name)
+        cache[keys[name]] = _rules_of(loaded[name]) if loaded[name] else []
+
+    for name, key in keys.items():
+        if key not in cache or rules.intersection(cache[key]):
+            _load(name)
+    if rules - set(handled) - {rule for plugin_rules in cache.values() for rule in plugin_rules}:
+        # a rule nobody handles may have been added to a plugin without changing it in a way the key notices
+        for name in plugins:
+            if name not in loaded:
+                _load(name)
+
+    if cache != cached:
+        _write_cache(dict(data, rules=cache))
+    return [loaded[name] for name in plugins if loaded.get(name, None) and rules.intersection(cache[keys[name]])]
 
 
 def validate_plugin(plugin_module):
@@ -30,3 +92,134 @@ def is_plugin_valid(plugin_module) -> bool:
         return False
     else:
         return True
+
+
+def __getattr__(name):
+    # plugins used to be imported eagerly into ``discovered_plugins`` when the module was imported
+    if name == 'discovered_plugins':
+        return {plugin: load(plugin) for plugin in discover().keys()}
+    raise AttributeError("module {} has no attribute {}".format(__name__, name))
+
+
+def _entry_points() -> list:
+    from importlib import metadata
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        return list(entry_points.select(group=ENTRY_POINT_GROUP))
+    return list(entry_points.get(ENTRY_POINT_GROUP, []))
+
+
+@lru_cache(maxsize=None)
+def _plugins() -> Dict[str, Tuple[str, Optional[str]]]:
+    """
+    :return: names of plugins mapped to their entry point values (eg. ``gitflow_my_linter`` or ``my.module:plugin``)
+        and names of distributions providing them (if known)
+    """
+    data = _read_cache()
+    paths = _paths_signature()
+    if data.get('paths', None) == paths and isinstance(data.get('plugins', None), dict):
+        return {name: tuple(plugin) for name, plugin in data['plugins'].items()}
+
+    plugins = {
+        name: (name, None)
+        for finder, name, ispkg
+        in pkgutil.iter_modules()
+        if name.startswith('gitflow_') and name.endswith('_linter') and name != 'gitflow_linter'
+    }
+    for entry_point in _entry_points():
+        distribution = getattr(entry_point, 'dist', None)
+        plugins[entry_point.name] = (entry_point.value, distribution.name if distribution else None)
+    _write_cache(dict(data, paths=paths, plugins=plugins))
+    return plugins
+
+
+def _paths_signature() -> List[list]:
+    """
+    Modification times of ``sys.path`` directories, they change whenever a module or a distribution is added to or
+    removed from a directory
+    """
+    signature = []
+    for path in sys.path:
+        try:
+            signature.append([path, os.stat(path or os.getcwd()).st_mtime_ns])
+        except OSError:
+            continue
+    return signature
+
+
+def _load_valid(name: str):
+    try:
+        plugin = load(name)
+    except BaseException:
+        return None
+    return plugin if is_plugin_valid(plugin_module=plugin) else None
+
+
+def _rules_of(plugin) -> List[str]:
+    return [visitor.rule for visitor in plugin.visitors(gitflow={})]
+
+
+def _cache_key(name: str) -> str:
+    value, distribution = _plugins()[name]
+    module = value.split(':')[0].strip()
+    return '{}={}@{}:{}'.format(name, value, _version(module, distribution), _modified(module))
+
+
+def _version(module: str, distribution: Optional[str]) -> str:
+    """
+    :return: version of the distribution providing the module, empty if it is not installed as a distribution
+    """
+    from importlib import metadata
+    try:
+        return metadata.version(distribution or module.split('.')[0])
+    except (metadata.PackageNotFoundError, ValueError):
+        return ''
+
+
+def _modified(module: str) -> str:
+    """
+    :return: location of the module (the whole package tree for packages), number of its python files and the latest
+        modification time of them. The top-level package is found without being imported.
+    """
+    try:
+        spec = importlib.util.find_spec(module.split('.')[0])
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None:
+        return ''
+    locations = list(spec.submodule_search_locations or []) or ([spec.origin] if spec.origin else [])
+    files = []
+    for location in locations:
+        if os.path.isdir(location):
+            for root, folders, names in os.walk(location):
+                folders[:] = [folder for folder in folders if folder != '__pycache__']
+                files.extend(os.path.join(root, name) for name in names if name.endswith('.py'))
+        else:
+            files.append(location)
+    modified = []
+    for path in files:
+        try:
+            modified.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            continue
+    return '{}#{}:{}'.format(os.pathsep.join(locations), len(modified), max(modified, default=0))
+
+
+def _read_cache() -> dict:
+    try:
+        with open(_CACHE_FILE, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_cache(data: dict):
+    try:
+        os.makedirs(os.path.dirname(_CACHE_FILE), exist_ok=True)
+        tmp_path = '{}.{}.tmp'.format(_CACHE_FILE, os.getpid())
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+        os.replace(tmp_path, _CACHE_FILE)
+    except OSError:
+        pass
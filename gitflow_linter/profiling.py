@@ -0,0 +1,86 @@
+"""
+Measures resources used to check a rule when the linter runs with ``--profile`` option.
+
+Counters are kept per thread, so rules checked concurrently (see ``--jobs``) are measured separately. Anything a rule
+loads for the first time is accounted to that rule, eg. the commit graph shared by all rules. When rules are checked
+concurrently, the graph is accounted to whichever rule happens to ask for it first, and rules waiting for it meanwhile
+get the waiting time but none of its git calls or commits.
+"""
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional
+
+from git import Git
+
+from gitflow_linter.report import Profile
+
+GIT_CALLS = 'git_calls'
+QUERIES = 'queries'
+COMMITS = 'commits'
+
+_local = threading.local()
+_install_lock = threading.Lock()
+_installed = False
+
+
+def count(counter: str, value: int = 1):
+    """
+    Increases the counter of the rule being profiled in the current thread, does nothing if no rule is profiled
+    """
+    counters = getattr(_local, 'counters', None)
+    if counters is not None:
+        counters[counter] += value
+
+
+@contextmanager
+def profiled(dump_path: Optional[str] = None):
+    """
+    Measures the code run in the context, the :class:`profile <gitflow_linter.report.Profile>` is available as
+    ``profile`` attribute of the returned holder once the context exits
+
+    :param dump_path: path of the file the ``cProfile`` statistics are dumped to (readable by ``pstats``)
+    """
+    _install()
+    holder = _ProfileHolder()
+    previous, _local.counters = getattr(_local, 'counters', None), Counter()
+    profiler = None
+    if dump_path:
+        import cProfile
+        profiler = cProfile.Profile()
+    started, cpu_started = time.perf_counter(), time.thread_time()
+    try:
+        if profiler:
+            profiler.enable()
+        yield holder
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(dump_path)
+        counters, _local.counters = _local.counters, previous
+        holder.profile = Profile(wall_time=time.perf_counter() - started, cpu_time=time.thread_time() - cpu_started,
+                                 git_calls=counters[GIT_CALLS], queries=counters[QUERIES], commits=counters[COMMITS])
+
+
+class _ProfileHolder:
+    profile: Optional[Profile] = None
+
+
+def _install():
+    """
+    Counts every git command run by GitPython. ``Git`` uses ``__slots__``, so ``execute`` cannot be wrapped per
+    instance and it is wrapped once, for all instances.
+    """
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        execute = Git.execute
+
+        def _counting_execute(self, *args, **kwargs):
+            count(GIT_CALLS)
+            return execute(self, *args, **kwargs)
+
+        Git.execute = _counting_execute
+        _installed = True
@@ -1,7 +1,7 @@
+from collections import Counter
 from datetime import datetime
 import logging
-from git import Reference
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from enum import Enum, unique
 
 
@@ -20,52 +20,142 @@ class Level(str, Enum):
         }.get(self, logging.DEBUG)
 
 
+class RelatedObject:
+    """
+    Detached description of a git object related to an :class:`Issue <Issue>`: name, SHA and commit date only, so
+    issues do not keep GitPython's objects alive
+    """
+
+    __slots__ = ('name', 'sha', 'committed_datetime')
+
+    def __init__(self, name: Optional[str], sha: Optional[str], committed_datetime: Optional[datetime]):
+        self.name = name
+        self.sha = sha
+        self.committed_datetime = committed_datetime
+
+    @classmethod
+    def of(cls, obj) -> Optional['RelatedObject']:
+        """
+        Describes a GitPython's reference (branch, tag), a commit or a :class:`RefRecord
+        <gitflow_linter.repository.RefRecord>`
+        """
+        if obj is None or isinstance(obj, RelatedObject):
+            return obj
+        commit = obj if hasattr(obj, 'committed_datetime') else getattr(obj, 'commit', None)
+        return cls(name=getattr(obj, 'name', None),
+                   sha=commit.hexsha if commit is not None else None,
+                   committed_datetime=commit.committed_datetime if commit is not None else None)
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'sha': self.sha,
+            'committed_datetime': self.committed_datetime.isoformat() if self.committed_datetime else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> Optional['RelatedObject']:
+        if not data:
+            return None
+        committed_datetime = data.get('committed_datetime', None)
+        return cls(name=data.get('name', None),
+                   sha=data.get('sha', None),
+                   committed_datetime=datetime.fromisoformat(committed_datetime) if committed_datetime else None)
+
+    def __repr__(self):
+        return self.name or self.sha or ''
+
+
+class Profile:
+    """
+    Resources used to check a rule, collected when the linter runs with ``--profile`` option
+    """
+
+    __slots__ = ('wall_time', 'cpu_time', 'git_calls', 'queries', 'commits')
+
+    def __init__(self, wall_time: float, cpu_time: float, git_calls: int, queries: int, commits: int):
+        """
+        :param wall_time: seconds spent on checking the rule
+        :param cpu_time: seconds of CPU time used by the thread checking the rule
+        :param git_calls: number of git commands run
+        :param queries: number of queries run by :class:`Repository <gitflow_linter.repository.Repository>`
+            (raw queries and loading the commit graph)
+        :param commits: number of commits loaded by :class:`Repository <gitflow_linter.repository.Repository>`
+            (commits of the commit graph, commits it resolves or returns)
+        """
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+        self.git_calls = git_calls
+        self.queries = queries
+        self.commits = commits
+
+    def to_dict(self) -> dict:
+        return {
+            'wall_time': round(self.wall_time, 6),
+            'cpu_time': round(self.cpu_time, 6),
+            'git_calls': self.git_calls,
+            'queries': self.queries,
+            'commits': self.commits,
+        }
+
+    def __repr__(self):
+        return '{:.3f}s wall, {:.3f}s CPU, {} git calls, {} queries, {} commits'.format(
+            self.wall_time, self.cpu_time, self.git_calls, self.queries, self.commits)
+
+
 class Issue:
 
+    __slots__ = ('level', 'description', 'obj')
+
     @classmethod
-    def info(cls, description: str, obj: Optional[Reference]=None):
+    def info(cls, description: str, obj=None):
         """
         Creates an ``Issue`` with INFO severity for related git object
         """
         return cls(Level.INFO, description, obj)
 
     @classmethod
-    def warning(cls, description: str, obj: Optional[Reference]=None):
+    def warning(cls, description: str, obj=None):
         """
         Creates an ``Issue`` with WARNING severity for related git object
         """
         return cls(Level.WARNING, description, obj)
 
     @classmethod
-    def error(cls, description: str, obj: Optional[Reference]=None):
+    def error(cls, description: str, obj=None):
         """
         Creates an ``Issue`` with ERROR severity for related git object
         """
         return cls(Level.ERROR, description, obj)
 
-    def __init__(self, level: Level, description: str, obj: Optional[Reference]=None):
+    def __init__(self, level: Level, description: str, obj=None):
         """
         :param level: Describes severity of the Issue
         :param description: Explanation of what is wrong
+        :param obj: related git object (a reference, a commit or a :class:`RefRecord
+            <gitflow_linter.repository.RefRecord>`), only its :class:`description <RelatedObject>` is kept
         """
         self.level = level
         self.description = description
-        self.obj = obj
+        self.obj = RelatedObject.of(obj)
 
     def is_created_between(self, date_from: datetime, date_to: datetime) -> bool:
-        if self.obj:
-            obj_date = None
-
-            if hasattr(self.obj, 'committed_datetime'):
-                obj_date = self.obj.committed_datetime
-            elif hasattr(self.obj, 'commit'):
-                obj_date = self.obj.commit.committed_datetime
-            elif hasattr(self.obj.object, 'committed_datetime'):
-                obj_date = self.obj.object.committed_datetime
-            
-            return date_from < obj_date.replace(tzinfo=None) < date_to if obj_date else True
-        
-        return True
+        obj_date = self.obj.committed_datetime if self.obj else None
+        return date_from < obj_date.replace(tzinfo=None) < date_to if obj_date else True
+
+    def to_dict(self) -> dict:
+        """
+        :return: stable, JSON serializable form of the issue
+        """
+        return {
+            'level': self.level.value,
+            'description': self.description,
+            'obj': self.obj.to_dict() if self.obj else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Issue':
+        return cls(Level(data['level']), data['description'], RelatedObject.from_dict(data.get('obj', None)))
 
     def __repr__(self):
         return "Issue(level={level}, description='{desc}', obj='{obj}')".format(level=self.level, desc=self.description, obj=self.obj)
@@ -74,15 +164,28 @@ class Issue:
 class Section:
     """
     Represents repository verification done for a single rule.
-    Results are represented by list of :class:`Issues <Issue>`.
+    Results are represented by list of :class:`Issues <Issue>`, issues are counted by severity as they are added, so
+    checking if the section contains errors or warnings does not go through the issues.
     """
 
+    __slots__ = ('rule', 'title', 'profile', '_issues', '_levels', '_counted')
+
     def __init__(self, rule: str, title: str, issues=None):
         if issues is None:
             issues = []
         self.rule = rule
         self.title = title
         self.issues = issues
+        self.profile: Optional[Profile] = None
+
+    @property
+    def issues(self) -> List[Issue]:
+        return self._issues
+
+    @issues.setter
+    def issues(self, issues: List[Issue]):
+        self._issues = issues
+        self._recount()
 
     def append(self, issue: Issue):
         """
@@ -91,29 +194,73 @@ class Section:
         :param issue: New issue detected
         :return:
         """
-        self.issues.append(issue)
+        self._sync()
+        self._issues.append(issue)
+        self._levels[issue.level] += 1
+        self._counted += 1
+
+    def extend(self, issues: Iterable[Issue]):
+        for issue in issues:
+            self.append(issue)
 
-    def extend(self, issues: list):
-        self.issues.extend(issues)
+    def count(self, level: Level) -> int:
+        """
+        :return: number of issues of given severity
+        """
+        self._sync()
+        return self._levels[level]
 
     @property
     def contains_issues(self) -> bool:
-        return len(self.issues) > 0
+        return len(self._issues) > 0
 
     @property
     def contains_errors(self) -> bool:
-        return len([issue for issue in self.issues if issue.level is Level.ERROR]) > 0
+        return self.count(Level.ERROR) > 0
 
     @property
     def contains_warns(self) -> bool:
-        return len([issue for issue in self.issues if issue.level is Level.WARNING]) > 0
+        return self.count(Level.WARNING) > 0
 
     def change_severity(self, to: Level):
-        for issue in self.issues:
+        for issue in self._issues:
             issue.level = to
-    
+        self._recount()
+
     def consider_issues_in_period(self, date_from: datetime, date_to: datetime):
-        self.issues = [issue for issue in self.issues if issue.is_created_between(date_from, date_to)]
+        self.issues = [issue for issue in self._issues if issue.is_created_between(date_from, date_to)]
+
+    def _recount(self):
+        self._levels = Counter(issue.level for issue in self._issues)
+        self._counted = len(self._issues)
+
+    def _sync(self):
+        # issues added to (or removed from) the list directly are not counted yet
+        if self._counted != len(self._issues):
+            self._recount()
+
+    def in_period(self, date_from: datetime, date_to: datetime) -> 'Section':
+        """
+        :return: copy of the section containing only issues created in the given period
+        """
+        section = Section(rule=self.rule, title=self.title,
+                          issues=[issue for issue in self.issues if issue.is_created_between(date_from, date_to)])
+        section.profile = self.profile
+        return section
+
+    def to_dict(self) -> dict:
+        """
+        :return: stable, JSON serializable form of the section
+        """
+        return {
+            'rule': self.rule,
+            'title': self.title,
+            'issues': [issue.to_dict() for issue in self.issues],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Section':
+        return cls(rule=data['rule'], title=data['title'], issues=[Issue.from_dict(i) for i in data['issues']])
 
     def __repr__(self):
         return "Section(rule={rule}, title='{title}')".format(rule=self.rule, title=self.title)
@@ -136,3 +283,18 @@ class Report:
     def consider_issues_only_in_period(self, date_from: datetime, date_to: datetime):
         for section in self.sections:
             section.consider_issues_in_period(date_from, date_to)
+
+    def to_dict(self) -> dict:
+        """
+        :return: stable, JSON serializable form of the report
+        """
+        return {
+            'repository': self.working_dir,
+            'statistics': self.stats,
+            'sections': [section.to_dict() for section in self.sections],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Report':
+        return cls(working_dir=data['repository'], stats=data['statistics'],
+                   sections=[Section.from_dict(s) for s in data['sections']])
@@ -1,20 +1,438 @@
+import asyncio
+import copy
 import os
+import subprocess
+import threading
 from abc import ABC, abstractmethod
-from typing import Optional
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple, NamedTuple, Dict, FrozenSet, List, Iterable, Iterator, Set, AbstractSet
 
-from git import Repo, Remote, RemoteReference, Commit, Head
-from git.util import IterableList
+from git import Repo, Remote, RemoteReference, Commit, Head, Git, GitCommandError
+from git.util import IterableList, hex_to_bin
 
-from gitflow_linter import Gitflow
+from gitflow_linter import Gitflow, profiling
+from gitflow_linter.objects import ObjectReader, tz_offset
+
+
+TAGS = 'refs/tags/'
+HEADS = 'refs/heads/'
+
+_TIMEZONE_MARGIN = timedelta(days=1)
+
+DEFAULT_CONCURRENCY = 4
+
+
+class RefSnapshot:
+    """
+    Immutable index of remote references taken at a single point in time.
+
+    References are kept sorted by name, so every prefix lookup (eg. all branches from ``origin/feature``) is a binary
+    search instead of a scan over all refs. Results of prefix lookups are memoized, the snapshot never changes.
+    """
+
+    def __init__(self, refs: IterableList, prefix: str = ''):
+        self._prefix = prefix
+        self._refs = tuple(sorted(refs, key=lambda r: r.name))
+        self._names = [r.name for r in self._refs]
+        self._by_name = {r.name: r for r in self._refs}
+        self._by_prefix = {}
+
+    def all(self) -> IterableList:
+        refs = IterableList('name', self._prefix)
+        refs.extend(self._refs)
+        return refs
+
+    def get(self, name: str) -> Optional[RemoteReference]:
+        return self._by_name.get(name, None)
+
+    def with_prefix(self, prefix: str) -> Tuple[RemoteReference, ...]:
+        refs = self._by_prefix.get(prefix, None)
+        if refs is None:
+            start = end = bisect_left(self._names, prefix)
+            while end < len(self._names) and self._names[end].startswith(prefix):
+                end += 1
+            refs = self._refs[start:end]
+            self._by_prefix[prefix] = refs
+        return refs
+
+    def __len__(self):
+        return len(self._refs)
+
+
+class RefRecord(NamedTuple):
+    """
+    Metadata of a reference loaded by :meth:`Repository.ref_table <Repository.ref_table>`. It exposes ``name``,
+    ``hexsha`` and ``committed_datetime`` like GitPython's objects do, so it can be used as an object related to an
+    :class:`Issue <gitflow_linter.report.Issue>` without loading any commit.
+    """
+    name: str
+    sha: str
+    commit_sha: Optional[str]
+    committed_date: Optional[int]
+    committer_tz_offset: int
+    upstream: str
+
+    FORMAT = '%00'.join(['%(refname)', '%(objectname)', '%(*objectname)', '%(committerdate:raw)',
+                         '%(*committerdate:raw)', '%(upstream)'])
+
+    @property
+    def hexsha(self) -> Optional[str]:
+        return self.commit_sha
+
+    @property
+    def committed_datetime(self) -> Optional[datetime]:
+        if self.committed_date is None:
+            return None
+        return datetime.fromtimestamp(self.committed_date, timezone(timedelta(seconds=self.committer_tz_offset)))
+
+    @classmethod
+    def parse(cls, line: str) -> Tuple[str, 'RefRecord']:
+        """
+        :param line: line of ``git for-each-ref`` output in :attr:`FORMAT <RefRecord.FORMAT>`
+        :return: full name of the reference and its record
+        """
+        refname, sha, peeled, committed, peeled_committed, upstream = line.split('\x00')
+        committed = (peeled_committed or committed).split()
+        return refname, cls(name=refname, sha=sha, commit_sha=(peeled or sha) if committed else None,
+                            committed_date=int(committed[0]) if committed else None,
+                            committer_tz_offset=tz_offset(committed[1]) if len(committed) == 2 else 0,
+                            upstream=upstream)
+
+
+class GraphCommit(NamedTuple):
+    sha: str
+    parents: Tuple[str, ...]
+    committed_date: int
+    summary: str
+
+    @property
+    def is_merge(self) -> bool:
+        return len(self.parents) > 1
+
+
+class CommitGraph:
+    """
+    In-memory commit graph of everything reachable from remote branches and tags.
+
+    The graph is loaded by a single streamed ``git log`` call and lets visitors answer ancestry, first-parent and merge
+    questions without walking the history again.
+    """
+
+    _FORMAT = '--format=format:%H%x00%P%x00%ct%x00%s'
+
+    def __init__(self, commits: Dict[str, GraphCommit]):
+        self._commits = commits
+        self._ancestors = {}
+        self._roots = None
+
+    @classmethod
+    def load(cls, repo: Repo, *revs: str) -> 'CommitGraph':
+        """
+        Loads graph of commits reachable from given revisions
+
+        :param repo: GitPython's repository
+        :param revs: revisions or options passed to ``git log``, eg. ``'--remotes=origin', '--tags'``
+        """
+        graph = cls(dict())
+        graph._read(repo.git.log(*revs, cls._FORMAT, as_process=True))
+        return graph
+
+    def extend(self, repo: Repo, tips: Iterable[str], known: Iterable[str]) -> int:
+        """
+        Adds commits reachable from ``tips`` but from none of ``known`` commits (like ``git log tips --not known``).
+        Commits never change, so everything memoized for commits that are already in the graph stays valid.
+
+        :param tips: SHAs of new or moved references
+        :param known: SHAs of references whose history is already in the graph
+        :return: number of commits added
+        """
+        # revisions are passed by stdin, since there may be too many of them for a command line
+        process = repo.git.log('--stdin', self._FORMAT, as_process=True, istream=subprocess.PIPE)
+        revs = list(tips) + ['^' + sha for sha in known]
+        writer = threading.Thread(target=self._write_revs, args=(process.proc.stdin, revs), daemon=True)
+        writer.start()
+        added = self._read(process)
+        writer.join()
+        return added
+
+    @staticmethod
+    def _write_revs(stdin, revs: List[str]):
+        try:
+            stdin.write(''.join(rev + '\n' for rev in revs).encode('ascii'))
+            stdin.close()
+        except OSError:
+            # git has exited already, its error is raised when the process is waited for
+            pass
+
+    def _read(self, process) -> int:
+        added = 0
+        for line in process.proc.stdout:
+            fields = line.decode('utf-8', errors='replace').rstrip('\n').split('\x00')
+            if len(fields) < 4 or fields[0] in self._commits:
+                continue
+            sha, parents, committed_date, summary = fields[0], fields[1], fields[2], '\x00'.join(fields[3:])
+            self._commits[sha] = GraphCommit(sha=sha, parents=tuple(parents.split()),
+                                             committed_date=int(committed_date), summary=summary)
+            # ancestors of a commit that was not in the graph yet have been memoized as empty
+            self._ancestors.pop(sha, None)
+            added += 1
+        if added:
+            self._roots = None
+        process.wait()
+        return added
+
+    def __contains__(self, sha: str) -> bool:
+        return sha in self._commits
+
+    def __len__(self):
+        return len(self._commits)
+
+    def get(self, sha: str) -> Optional[GraphCommit]:
+        return self._commits.get(sha, None)
+
+    def roots(self) -> FrozenSet[str]:
+        """
+        :return: commits without parents (like ``git rev-list --max-parents=0``), there may be several of them, eg. when
+            unrelated histories have been merged
+        """
+        if self._roots is None:
+            self._roots = frozenset(sha for sha, commit in self._commits.items() if not commit.parents)
+        return self._roots
+
+    def first_parents(self, sha: str, exclude: Iterable[str] = frozenset()) -> List[GraphCommit]:
+        """
+        :param sha: commit where the walk starts
+        :param exclude: walk stops on any of these commits
+        :return: commits on the first-parent line of ``sha``, newest first (like ``git log --first-parent``)
+        """
+        history = []
+        commit = self.get(sha)
+        while commit is not None and commit.sha not in exclude:
+            history.append(commit)
+            commit = self.get(commit.parents[0]) if commit.parents else None
+        return history
+
+    def ancestors(self, sha: str) -> FrozenSet[str]:
+        """
+        :return: all commits reachable from ``sha`` (including the commit itself), memoized per commit
+        """
+        ancestors = self._ancestors.get(sha, None)
+        if ancestors is None:
+            ancestors = frozenset(self._walk([sha], exclude=frozenset()))
+            self._ancestors[sha] = ancestors
+        return ancestors
+
+    def is_ancestor(self, ancestor: str, descendant: str) -> bool:
+        return ancestor in self.ancestors(descendant)
+
+    def only_in(self, sha: str, excluded: str) -> List[str]:
+        """
+        :return: commits reachable from ``sha`` but not from ``excluded`` (like ``git rev-list excluded..sha``)
+        """
+        return list(self._walk([sha], exclude=self.ancestors(excluded)))
+
+    def unique_to(self, sha: str, others: Iterable[str]) -> Set[str]:
+        """
+        :return: commits reachable from ``sha`` but from none of ``others`` (like ``git rev-list sha --not others``)
+        """
+        return self._walk([sha], exclude=self._walk(others, exclude=frozenset()))
+
+    def _walk(self, shas: Iterable[str], exclude: AbstractSet[str]) -> Set[str]:
+        seen = set()
+        stack = list(shas)
+        while stack:
+            current = stack.pop()
+            if current in seen or current in exclude or current not in self._commits:
+                continue
+            seen.add(current)
+            stack.extend(self._commits[current].parents)
+        return seen
+
+
+class _StreamingGit:
+    """
+    Proxy of GitPython's ``Git`` starting commands as processes, so their output can be read line by line
+    """
+
+    def __init__(self, git: Git):
+        self._git = git
+
+    def __getattr__(self, name):
+        command = getattr(self._git, name)
+        return lambda *args, **kwargs: command(*args, as_process=True, **kwargs)
+
+
+class _Loaded:
+    """
+    Data of a repository loaded lazily and shared by its views and forks (see :meth:`Repository.fork
+    <Repository.fork>`), so whatever is loaded by any of them is loaded once for all of them. Loading is guarded by
+    the lock, since forks are used by different threads.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.graph: Optional[CommitGraph] = None
+        self.ref_table: Optional[Dict[str, RefRecord]] = None
+        self.tags_by_commit: Optional[Dict[str, List[RefRecord]]] = None
+        self.merged: Dict[str, FrozenSet[str]] = {}
+
+
+class _Handles:
+    """
+    Objects bound to a GitPython's ``Repo`` and shared by views of a repository, but not by its forks
+    """
+
+    def __init__(self):
+        self.refs: Optional[RefSnapshot] = None
+        self.objects: Optional[ObjectReader] = None
 
 
 class Repository:
-    def __init__(self, repo: Repo, gitflow: Gitflow, should_fetch=False, allow_dirty=False):
+    def __init__(self, repo: Repo, gitflow: Gitflow, should_fetch=False, allow_dirty=False,
+                 date_from: Optional[datetime] = None, date_to: Optional[datetime] = None):
+        """
+        :param date_from: issues of branches and commits committed before the date are not going to be reported, so
+            visitors may skip them
+        :param date_to: issues of branches and commits committed after the date are not going to be reported, so
+            visitors may skip them
+        """
         self.repo = repo
         self.gitflow = gitflow
+        self.date_from = date_from
+        self.date_to = date_to
+        self._loaded = _Loaded()
+        self._handles = _Handles()
+        self.scope = None
         self.assert_repo(allow_dirty)
         if should_fetch:
-            self.remote.fetch('--prune')
+            self.fetch()
+
+    def fetch(self):
+        """
+        Fetches the remote (pruning deleted branches) and refreshes the snapshot of references
+        """
+        self.remote.fetch(prune=True)
+        self.refresh()
+
+    def refresh(self):
+        """
+        Drops the snapshot of references and the commit graph, the next lookup will load them again
+        """
+        loaded = self._loaded
+        with loaded.lock:
+            self._handles.refs = None
+            loaded.graph = None
+            loaded.ref_table = None
+            loaded.tags_by_commit = None
+            loaded.merged = {}
+
+    def update(self) -> bool:
+        """
+        Takes a new snapshot of references, like :meth:`refresh <refresh>` does, but keeps the commit graph warm:
+        it is extended only by commits that appeared since the previous snapshot.
+
+        :return: ``True`` if any reference has been added, moved or deleted since the previous snapshot
+        """
+        loaded = self._loaded
+        with loaded.lock:
+            previous = loaded.ref_table
+            self._handles.refs = None
+            loaded.ref_table = None
+            loaded.tags_by_commit = None
+            current = self.ref_table()
+            if previous == current:
+                return False
+
+            loaded.merged = {}
+            if loaded.graph is not None and previous is not None:
+                known = {record.sha for name, record in previous.items() if not name.startswith(HEADS)}
+                new = sorted({record.sha for name, record in current.items()
+                              if not name.startswith(HEADS) and record.sha not in known})
+                try:
+                    added = loaded.graph.extend(self.repo, tips=new, known=sorted(known)) if new else 0
+                except GitCommandError:
+                    # commits of deleted references may have been garbage collected, the graph is loaded again
+                    loaded.graph = None
+                else:
+                    profiling.count(profiling.QUERIES)
+                    profiling.count(profiling.COMMITS, added)
+            else:
+                loaded.graph = None
+            return True
+
+    def close(self):
+        """
+        Stops long-lived git processes started by the repository
+        """
+        if self._handles.objects is not None:
+            self._handles.objects.close()
+        self.repo.close()
+
+    def fork(self) -> 'Repository':
+        """
+        Creates a repository that works on the same directory by using its own GitPython's ``Repo``, so it can be used
+        by another thread. The commit graph and records of references are shared (and loaded once by whichever of
+        forks needs them first), references are looked up again by the fork.
+        """
+        forked = copy.copy(self)
+        forked.repo = Repo(self.repo.working_dir)
+        forked._handles = _Handles()
+        return forked
+
+    def scoped(self, names: Set[str]) -> 'Repository':
+        """
+        Creates a view of the repository that asks visitors to report issues only for given branches.
+        The view shares references and commits with the repository, whatever is loaded by the view is loaded for the
+        repository as well.
+
+        :param names: names of branches to check, eg. ``{'origin/feature/1-login'}``
+        """
+        view = copy.copy(self)
+        view.scope = set(names)
+        return view
+
+    def windowed(self, date_from: Optional[datetime], date_to: Optional[datetime]) -> 'Repository':
+        """
+        Creates a view of the repository with another date window (see :meth:`__init__ <__init__>`), the view shares
+        references and commits with the repository like :meth:`scoped <scoped>` views do
+        """
+        view = copy.copy(self)
+        view.date_from, view.date_to = date_from, date_to
+        return view
+
+    def in_scope(self, name: str) -> bool:
+        """
+        :return: ``True`` if issues of the given branch should be reported, it is always the case unless the repository
+            is a :meth:`scoped <scoped>` view or the branch has been committed out of the date window
+        """
+        return (self.scope is None or name in self.scope) and self.in_window(name)
+
+    def in_window(self, name: str) -> bool:
+        """
+        :param name: name of a remote branch (eg. ``origin/develop``) or a tag (eg. ``refs/tags/1.0.0``)
+        :return: ``True`` if the reference has been committed between ``date_from`` and ``date_to``, the same way
+            :meth:`Issue.is_created_between <gitflow_linter.report.Issue.is_created_between>` checks it. Committer dates
+            of all references are loaded by a single ``git for-each-ref`` call, so no commit is loaded.
+        """
+        if self.date_from is None and self.date_to is None:
+            return True
+        record = self.ref_table().get(name, None)
+        if record is None or record.committed_date is None:
+            return True
+        committed = record.committed_datetime.replace(tzinfo=None)
+        return (self.date_from is None or self.date_from < committed) and \
+               (self.date_to is None or committed < self.date_to)
+
+    def may_be_in_window(self, committed_date: int) -> bool:
+        """
+        :param committed_date: commit timestamp, eg. :attr:`GraphCommit.committed_date <GraphCommit.committed_date>`
+        :return: ``False`` if the commit has been surely committed out of the date window. The window is widened by a
+            day, since issues are filtered by the local time of the committer which is not known from the timestamp.
+        """
+        committed = datetime.fromtimestamp(committed_date, timezone.utc).replace(tzinfo=None)
+        return (self.date_from is None or self.date_from < committed + _TIMEZONE_MARGIN) and \
+               (self.date_to is None or committed - _TIMEZONE_MARGIN < self.date_to)
 
     def assert_repo(self, allow_dirty: bool):
         if self.repo.bare:
@@ -33,13 +451,171 @@ class Repository:
     def remote(self) -> Remote:
         return self.repo.remotes[0]
 
+    @property
+    def refs(self) -> RefSnapshot:
+        """
+        :return: :class:`snapshot <RefSnapshot>` of remote references, taken once and shared by all lookups
+        """
+        if self._handles.refs is None:
+            self._handles.refs = RefSnapshot(self.remote.refs, prefix='{}/'.format(self.remote.name))
+        return self._handles.refs
+
+    @property
+    def objects(self) -> ObjectReader:
+        """
+        :return: :class:`reader <gitflow_linter.objects.ObjectReader>` resolving git objects in batches by long-lived
+            ``git cat-file`` processes
+        """
+        if self._handles.objects is None:
+            self._handles.objects = ObjectReader(self.repo.git)
+        return self._handles.objects
+
+    @property
+    def graph(self) -> CommitGraph:
+        """
+        :return: :class:`graph <CommitGraph>` of commits reachable from remote branches and tags, loaded once (when
+            a visitor needs it first) and shared by all visitors
+        """
+        loaded = self._loaded
+        if loaded.graph is None:
+            with loaded.lock:
+                if loaded.graph is None:
+                    loaded.graph = CommitGraph.load(self.repo, '--remotes={}'.format(self.remote.name), '--tags')
+                    profiling.count(profiling.QUERIES)
+                    profiling.count(profiling.COMMITS, len(loaded.graph))
+        return loaded.graph
+
+    def ref_table(self) -> Dict[str, RefRecord]:
+        """
+        :return: :class:`records <RefRecord>` of every remote branch, tag and local branch, loaded by a single
+            ``git for-each-ref`` call. Remote branches are keyed by their names (eg. ``origin/develop``), tags and local
+            branches by their full names (eg. ``refs/tags/1.0.0``, ``refs/heads/develop``). Tags are peeled, so their
+            records describe commits they point to.
+        """
+        loaded = self._loaded
+        if loaded.ref_table is None:
+            with loaded.lock:
+                if loaded.ref_table is None:
+                    loaded.ref_table = self._load_ref_table()
+        return loaded.ref_table
+
+    def _load_ref_table(self) -> Dict[str, RefRecord]:
+        remotes = 'refs/remotes/'
+        lines = self.iter_raw_query(lambda git: git.for_each_ref('--format=' + RefRecord.FORMAT,
+                                                                 remotes + self.remote.name, TAGS[:-1], HEADS[:-1]),
+                                    predicate=lambda line: line.strip())
+        table = {}
+        for line in lines:
+            refname, record = RefRecord.parse(line)
+            name = refname[len(remotes):] if refname.startswith(remotes) else refname
+            table[name] = record._replace(name=name[len(TAGS):] if name.startswith(TAGS) else name)
+        return table
+
+    def ref_record(self, name: str) -> Optional[RefRecord]:
+        """
+        :param name: name of a remote branch (eg. ``origin/develop``) or a tag (eg. ``refs/tags/1.0.0``)
+        """
+        return self.ref_table().get(name, None)
+
+    def tags_by_commit(self) -> Dict[str, List[RefRecord]]:
+        """
+        :return: index of tags by SHAs of commits they point to (annotated tags are peeled), built once from
+            :meth:`ref_table <ref_table>`
+        """
+        loaded = self._loaded
+        if loaded.tags_by_commit is None:
+            index = {}
+            for name, record in self.ref_table().items():
+                if name.startswith(TAGS) and record.commit_sha:
+                    index.setdefault(record.commit_sha, []).append(record)
+            loaded.tags_by_commit = index
+        return loaded.tags_by_commit
+
+    def ref_state(self) -> Dict[str, str]:
+        """
+        :return: SHA of every remote branch, tag and local branch, see :meth:`ref_table <ref_table>`. Remote branches are
+            keyed by their names (eg. ``origin/develop``), tags and local branches by their full names (eg.
+            ``refs/tags/1.0.0``, ``refs/heads/develop``). Local branches are included, since targets of
+            :meth:`merged_into <merged_into>` are resolved to them.
+        """
+        return {name: record.sha for name, record in self.ref_table().items()}
+
+    def merged_into(self, target: str) -> FrozenSet[str]:
+        """
+        Names of remote branches merged into the target, like ``git branch -r --merged target`` returns them. They are
+        found by a single walk of the commit graph and memoized per target, so any number of visitors may ask about
+        merge status of any branch.
+
+        :param target: revision the branches are merged into, eg. ``develop`` (the local branch like git resolves it)
+            or ``origin/develop``
+        """
+        merged = self._loaded.merged.get(target, None)
+        if merged is None:
+            table = self.ref_table()
+            record = next(iter([table[name] for name in self.target_refs(target) if name in table]), None)
+            if record is not None and record.commit_sha in self.graph:
+                ancestors = self.graph.ancestors(record.commit_sha)
+                merged = frozenset(name for name, branch in table.items()
+                                   if not name.startswith(TAGS) and not name.startswith(HEADS)
+                                   and branch.commit_sha in ancestors)
+            else:
+                # the target is out of the graph (eg. unpushed local branch), git is asked
+                merged = frozenset(self.iter_raw_query(lambda git: git.branch('-r', '--merged', target),
+                                                       predicate=lambda line: line.strip(),
+                                                       map_line=lambda line: line.split(' -> ')[0]))
+            self._loaded.merged[target] = merged
+        return merged
+
+    @staticmethod
+    def target_refs(target: str) -> List[str]:
+        """
+        :param target: see :meth:`merged_into <merged_into>`
+        :return: names of references (see :meth:`ref_table <ref_table>`) the target may be resolved to, in the order
+            git resolves them, eg. ``['refs/tags/develop', 'refs/heads/develop', 'develop']``. Results of visitors
+            asking about merge status depend on them (see :meth:`BaseVisitor.dependencies
+            <gitflow_linter.visitor.BaseVisitor.dependencies>`).
+        """
+        return [TAGS + target, HEADS + target, target]
+
+    def not_merged_into(self, target: str) -> FrozenSet[str]:
+        """
+        :return: names of remote branches not merged into the target, see :meth:`merged_into <merged_into>`
+        """
+        return frozenset(name for name in self.ref_state()
+                         if not name.startswith(TAGS) and not name.startswith(HEADS)) - self.merged_into(target)
+
+    def is_merged(self, name: str, target: str) -> bool:
+        """
+        :param name: name of a remote branch, eg. ``origin/feature/1-login``
+        :param target: see :meth:`merged_into <merged_into>`
+        """
+        return name in self.merged_into(target)
+
+    def root_commits(self) -> FrozenSet[str]:
+        """
+        :return: SHAs of initial commits (commits without parents) reachable from remote branches and tags, see
+            :meth:`CommitGraph.roots <CommitGraph.roots>`
+        """
+        return self.graph.roots()
+
+    def sha(self, name: str) -> Optional[str]:
+        """
+        :param name: name of a remote branch, eg. ``origin/develop``
+        :return: SHA of the commit the branch points to
+        """
+        branch = self.branch(name)
+        if not branch:
+            return None
+        record = self.ref_record(branch.name)
+        return record.commit_sha if record else branch.commit.hexsha
+
     def branches(self, folder: str = None) -> IterableList:
         path = None if folder is None else '{}/{}'.format(self.remote.name, folder)
-        return self.remote.refs if path is None else [r for r in self.remote.refs if path in r.name]
+        return self.refs.all() if path is None else list(self.refs.with_prefix(path))
 
     def branch(self, name: str = None) -> RemoteReference:
         path = name if '/' in name else '{}/{}'.format(self.remote.name, name)
-        return next(iter([r for r in self.remote.refs if r.name.startswith(path)]), None)
+        return self.refs.get(path) or next(iter(self.refs.with_prefix(path)), None)
 
     @property
     def master(self) -> Head:
@@ -60,23 +636,16 @@ class Repository:
         :return: set of unique commits for branch passed as the
 
         """
-        other_heads = [head for head in self.branches() if not head.name == branch.name]
-        all_commits = list(self.repo.iter_commits(branch.name, max_count=100))
-        commits = set(all_commits)
-
-        def _remove_commits_exist_in(other_branch: RemoteReference):
-            other_branch_commits = self.repo.iter_commits(other_branch.name, max_count=100)
-            for c in other_branch_commits:
-                element = next((commit for commit in commits if commit.hexsha == c.hexsha), None)
-                if element and (not force_including_head or element.hexsha != branch.commit.hexsha):
-                    commits.remove(element)
-
-        for other_branch in other_heads:
-            _remove_commits_exist_in(other_branch=other_branch)
-            if not commits:
-                break
+        refs = self.ref_table()
+        head = refs[branch.name].commit_sha if branch.name in refs else branch.commit.hexsha
+        other_heads = [record.commit_sha for name, record in refs.items()
+                       if name != branch.name and not name.startswith(TAGS) and not name.startswith(HEADS)]
+        unique = self.graph.unique_to(head, others=other_heads)
+        if force_including_head and head in self.graph:
+            unique.add(head)
 
-        return commits
+        profiling.count(profiling.COMMITS, len(unique))
+        return {Commit(self.repo, hex_to_bin(sha)) for sha in unique}
 
     def raw_query(self, query: callable, predicate: callable = None, map_line: callable = None):
         """
@@ -91,20 +660,102 @@ class Repository:
         :return: list of lines returned by query that matches optional predicate,
             eg. ``["sha-of-commit1", "sha-of-commit2", ...]``
         """
+        profiling.count(profiling.QUERIES)
         return [line.strip() if not map_line else map_line(line.strip())
-                for line in query(self.repo.git).split(os.linesep)
+                for line in query(self.repo.git).split('\n')
                 if predicate is None or predicate(line)]
 
+    def iter_raw_query(self, query: callable, predicate: callable = None, map_line: callable = None) -> Iterator:
+        """
+        Streaming variant of :meth:`raw_query <raw_query>`: lines are yielded as git prints them, so the output is never
+        held in memory at once. If the iteration is stopped early (eg. by ``break``), git is stopped as well.
+
+        :param query: callable running a single git command, eg. ``lambda git: git.log('--first-parent', 'master')``
+        :param predicate: see :meth:`raw_query <raw_query>`
+        :param map_line: see :meth:`raw_query <raw_query>`
+        :return: iterator of lines printed by git that match optional predicate
+        """
+        profiling.count(profiling.QUERIES)
+        process = query(_StreamingGit(self.repo.git))
+        finished = False
+        try:
+            for output in process.proc.stdout:
+                line = output.decode('utf-8', errors='replace').rstrip('\n')
+                if predicate is None or predicate(line):
+                    yield line.strip() if not map_line else map_line(line.strip())
+            finished = True
+        finally:
+            if finished:
+                # raises GitCommandError if git has failed
+                process.wait()
+            else:
+                process.proc.kill()
+                process.proc.wait()
+
     def commit(self, sha: str, branch_name: str) -> Optional[Commit]:
-        branch = self.branch(branch_name)
-        if branch:
-            return next(iter([commit for commit in list(self.repo.iter_commits(branch.name, max_count=1000)) if commit.hexsha == sha]), None)
+        """
+        :param sha: full SHA of the commit
+        :param branch_name: name of a remote branch that must contain the commit
+        :return: the commit (loaded lazily) or ``None`` if it is not a part of the branch
+        """
+        head = self.sha(branch_name)
+        if head and self.graph.is_ancestor(sha, head):
+            profiling.count(profiling.COMMITS)
+            return Commit(self.repo, hex_to_bin(sha))
         return None
 
     def apply(self, visitor, *args, **kwargs):
         return visitor.visit(self, *args, **kwargs)
 
 
+class AsyncRepository:
+    """
+    Asynchronous facade of a :class:`Repository <Repository>`: raw git queries run as asyncio subprocesses, so
+    independent queries of a visitor (see :meth:`BaseVisitor.visit_async
+    <gitflow_linter.visitor.BaseVisitor.visit_async>`) can be awaited concurrently. Everything else (references, the
+    commit graph, objects) is delegated to the wrapped repository.
+
+    :param concurrency: maximum number of git processes run at a time
+    """
+
+    def __init__(self, repository: Repository, concurrency: int = DEFAULT_CONCURRENCY):
+        self.repository = repository
+        self.concurrency = concurrency
+        self._semaphore = None
+
+    def __getattr__(self, name):
+        return getattr(self.repository, name)
+
+    async def git(self, *args: str, predicate: callable = None, map_line: callable = None) -> list:
+        """
+        Asynchronous variant of :meth:`Repository.raw_query <Repository.raw_query>`. The git command is given by its
+        arguments instead of a callable, since it is run as an asyncio subprocess and not by GitPython.
+        ``raw_query`` itself is delegated to the wrapped repository as everything else.
+
+        :param args: git command and its arguments, eg. ``'log', '--format=format:%H', 'master'``
+        :return: list of lines printed by git that match optional predicate
+        """
+        if self._semaphore is None:
+            # created lazily, so it belongs to the running event loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        command = [Git.GIT_PYTHON_GIT_EXECUTABLE or 'git'] + list(args)
+        async with self._semaphore:
+            profiling.count(profiling.GIT_CALLS)
+            profiling.count(profiling.QUERIES)
+            process = await asyncio.create_subprocess_exec(
+                *command, cwd=self.repository.repo.working_dir, env=dict(os.environ, LANGUAGE='C', LC_ALL='C'),
+                stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise GitCommandError(command, process.returncode, stderr)
+        return [line.strip() if not map_line else map_line(line.strip())
+                for line in stdout.decode('utf-8', errors='replace').split('\n')
+                if predicate is None or predicate(line)]
+
+    async def apply(self, visitor, *args, **kwargs):
+        return await visitor.visit_async(self, *args, **kwargs)
+
+
 class RepositoryVisitor(ABC):
 
     @abstractmethod
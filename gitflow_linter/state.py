@@ -0,0 +1,116 @@
+import json
+import os
+import re
+from datetime import date
+from typing import Dict, List, Optional, Set
+
+from gitflow_linter.report import Report, Section
+from gitflow_linter.repository import Repository
+
+
+class LintState:
+    """
+    State of the repository recorded by ``--since-state`` mode after a run: SHAs of references (see
+    :meth:`Repository.ref_state <gitflow_linter.repository.Repository.ref_state>`), arguments of rules, the date window
+    and the report. Issues of the report are filtered by the date window, which is enough since the state is used only
+    for the same window.
+
+    The next run compares current references with the recorded ones. Rules that check branches one by one (see
+    :meth:`BaseVisitor.branch_folders <gitflow_linter.visitor.BaseVisitor.branch_folders>`) are checked again only for
+    branches that were added, moved or deleted, issues of other branches are carried forward from the recorded report.
+    Rules are checked fully if any other of their dependencies has changed (eg. the local ``develop`` branch they ask
+    about merges into), if the state has been recorded on another day, since some of them depend on time, or for
+    another date window, since visitors skip branches out of the window.
+    """
+
+    def __init__(self, created: str, refs: Dict[str, str], args: dict, report: Optional[Report],
+                 window: Optional[List[Optional[str]]] = None):
+        self.created = created
+        self.refs = refs
+        self.args = args
+        self.report = report
+        self.window = window
+        self._changed = None
+
+    @staticmethod
+    def window_of(repo: Repository) -> List[Optional[str]]:
+        """
+        :return: serializable date window of the repository
+        """
+        return [value.isoformat() if value else None for value in (repo.date_from, repo.date_to)]
+
+    @classmethod
+    def load(cls, path: str) -> Optional['LintState']:
+        """
+        :return: recorded state or ``None`` if it does not exist or cannot be read
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            return cls(created=data['created'], refs=data['refs'], args=data['args'],
+                       report=Report.from_dict(data['report']), window=data.get('window', None))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, path: str):
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({
+                'created': self.created,
+                'refs': self.refs,
+                'args': self.args,
+                'window': self.window,
+                'report': self.report.to_dict(),
+            }, file, default=str)
+        os.replace(tmp_path, path)
+
+    def changed(self, refs: Dict[str, str]) -> Set[str]:
+        """
+        :param refs: current SHAs of references, see :meth:`Repository.ref_state
+            <gitflow_linter.repository.Repository.ref_state>`
+        :return: names of references that were added, moved or deleted since the state was recorded
+        """
+        if self._changed is None:
+            self._changed = {name for name in set(refs) | set(self.refs) if refs.get(name) != self.refs.get(name)}
+        return self._changed
+
+    def scope(self, repo: Repository, visitor, kwargs: dict) -> Optional[Set[str]]:
+        """
+        :return: names of branches the visitor must check again or ``None`` if the rule must be checked fully
+        """
+        folders = visitor.branch_folders(repo)
+        dependencies = visitor.dependencies(repo)
+        previous = self.previous_section(visitor.rule)
+        if folders is None or dependencies is None or previous is None or self.created != date.today().isoformat() \
+                or self.args.get(visitor.rule, None) != kwargs or self.window != self.window_of(repo):
+            return None
+
+        changed = self.changed(repo.ref_state())
+        shared = [prefix for prefix in dependencies if prefix not in folders]
+        if any(name.startswith(prefix) for name in changed for prefix in shared):
+            return None
+
+        scope = {name for name in changed if any(name.startswith(prefix) for prefix in folders)}
+        if scope:
+            # issues mentioning changed branches (eg. dependant features) may have become outdated
+            mentioned = re.compile('|'.join(r'(?<![\w/.-]){}(?![\w/.-])'.format(re.escape(name)) for name in scope))
+            scope.update(issue.obj.name for issue in previous.issues
+                         if issue.obj and issue.obj.name and mentioned.search(issue.description))
+            scope.update(visitor.related_branches(repo, scope))
+        return scope
+
+    def merge(self, rule: str, section: Section, scope: Set[str]) -> Section:
+        """
+        :return: the section checked for given scope of branches extended with carried forward issues of other branches
+        """
+        carried = [issue for issue in self.previous_section(rule).issues
+                   if issue.obj and issue.obj.name and issue.obj.name not in scope]
+        return Section(rule=section.rule, title=section.title, issues=carried + section.issues)
+
+    def previous_section(self, rule: str) -> Optional[Section]:
+        if not self.report:
+            return None
+        return next(iter([section for section in self.report.sections
+                          if section.rule == rule and section.title != 'ERROR!']), None)
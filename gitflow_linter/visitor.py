@@ -1,15 +1,17 @@
 from abc import ABC, abstractmethod
+import asyncio
 from datetime import datetime, timedelta
 import os
-from typing import List
-from functools import wraps
+import re
+from typing import List, Optional, Dict, Hashable, Iterable, Pattern, Set
+from functools import lru_cache, partial, wraps
 
 from git import Head
 from git.util import IterableList
 
 from gitflow_linter import Gitflow
 from gitflow_linter.report import Section, Issue, Level
-from gitflow_linter.repository import Repository, RepositoryVisitor
+from gitflow_linter.repository import Repository, AsyncRepository, RepositoryVisitor, TAGS
 
 
 def arguments_checker(keywords):
@@ -27,6 +29,28 @@ def arguments_checker(keywords):
     return wrap
 
 
+@lru_cache(maxsize=None)
+def _compiled(regex: str) -> Pattern:
+    return re.compile(regex)
+
+
+@lru_cache(maxsize=1 << 17)
+def _follows_convention(regex: str, name: str) -> bool:
+    return _compiled(regex).search(name) is not None
+
+
+def not_following_convention(regex: str, names: Iterable[str]) -> List[str]:
+    """
+    Matches names against a naming convention. The pattern is compiled once and results are memoized per pattern and
+    name, so names already checked (eg. by a previous run in a long-lived process) are not matched again.
+
+    :param regex: regular expression the names must contain a match of
+    :return: names not following the convention, in the given order
+    """
+    _compiled(regex)  # an invalid pattern fails before any name is checked
+    return [name for name in names if not _follows_convention(regex, name)]
+
+
 class BaseVisitor(RepositoryVisitor, ABC):
     """
     Abstract class describing how gitflow-linter works. A visitor must provide a rule that it is supposed to verify.
@@ -57,6 +81,59 @@ class BaseVisitor(RepositoryVisitor, ABC):
         """
         pass
 
+    async def visit_async(self, repo: AsyncRepository, *args, **kwargs) -> Section:
+        """
+        Asynchronous variant of :meth:`visit <visit>`, used when the rule is checked with :class:`AsyncRepository
+        <gitflow_linter.repository.AsyncRepository>`. Visitors that run several independent git queries may override
+        it and await them concurrently by :meth:`AsyncRepository.git
+        <gitflow_linter.repository.AsyncRepository.git>`. By default :meth:`visit <visit>` is run in a thread, so
+        synchronous visitors (eg. of plugins) keep working.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.visit, repo.repository, *args, **kwargs))
+
+    def dependencies(self, repo: Repository) -> Optional[List[str]]:
+        """
+        Tells the :class:`result cache <gitflow_linter.cache.ResultCache>` which references the result of the visit
+        depends on. The cached result is reused as long as none of them changes.
+
+        :param repo: Tiny wrapper for GitPython's repository
+        :return: names or prefixes of names of references, eg. ``['origin/develop', 'origin/feature']``, tags are
+            prefixed by ``refs/tags/`` and local branches by ``refs/heads/``. Every reference the result reads must be
+            covered, including targets of :meth:`Repository.merged_into
+            <gitflow_linter.repository.Repository.merged_into>` (see :meth:`Repository.target_refs
+            <gitflow_linter.repository.Repository.target_refs>`). ``None`` (default) means the result is never cached
+        """
+        return None
+
+    def branch_folders(self, repo: Repository) -> Optional[List[str]]:
+        """
+        Tells ``--since-state`` mode which branches the rule checks one by one. If the rule supports the mode, it
+        reports issues only for branches accepted by :meth:`Repository.in_scope
+        <gitflow_linter.repository.Repository.in_scope>` and issues of other branches are carried forward from the
+        previous run. Changes of the remaining :meth:`dependencies <dependencies>` make the rule be checked fully.
+
+        :param repo: Tiny wrapper for GitPython's repository
+        :return: prefixes of names of branches checked one by one, ``None`` (default) if the rule is always checked
+            fully
+        """
+        return None
+
+    def related_branches(self, repo: Repository, names: Set[str]) -> Set[str]:
+        """
+        Tells ``--since-state`` mode which other branches have to be checked again together with given ones, since
+        their issues depend on the given branches (eg. features sharing commits). Issues of related branches are not
+        carried forward from the previous run.
+
+        :param repo: Tiny wrapper for GitPython's repository
+        :param names: names of branches (from :meth:`branch_folders <branch_folders>`) checked again
+        :return: names of related branches, none by default
+        """
+        return set()
+
+    def _folders(self, repo: Repository, *folders: str) -> List[str]:
+        return ['/'.join([repo.remote.name, folder]) for folder in folders]
+
 
 class StatsRepositoryVisitor(RepositoryVisitor):
 
@@ -95,6 +172,9 @@ class SingleBranchesVisitor(BaseVisitor):
     def rule(self) -> str:
         return 'single_master_and_develop'
 
+    def dependencies(self, repo: Repository) -> List[str]:
+        return self._folders(repo, self.gitflow.master, self.gitflow.develop)
+
     def visit(self, repo: Repository, **kwargs) -> Section:
         section = Section(rule=self.rule, title='Checked if repo contains single release history branch and single '
                                                 'integration branch')
@@ -116,18 +196,28 @@ class OldDevelopmentBranchesVisitor(BaseVisitor):
     def rule(self) -> str:
         return 'no_old_development_branches'
 
+    def dependencies(self, repo: Repository) -> List[str]:
+        return self._folders(repo, self.gitflow.develop, self.gitflow.features, self.gitflow.fixes) + \
+               repo.target_refs(self.gitflow.develop)
+
+    def branch_folders(self, repo: Repository) -> List[str]:
+        return self._folders(repo, self.gitflow.features, self.gitflow.fixes)
+
     @arguments_checker(['max_days_features'])
     def visit(self, repo: Repository, **kwargs) -> Section:
         section = Section(rule=self.rule, title='Checked if repo contains abandoned feature branches')
         deadline = datetime.now() - timedelta(days=kwargs['max_days_features'])
-        merged_branches = repo.raw_query(lambda git: git.branch('-r', '--merged', self.gitflow.develop))
+        merged_branches = repo.merged_into(self.gitflow.develop)
 
         def _check_for_issues(branches: IterableList, name: str):
             for branch in branches:
-                if deadline > branch.commit.committed_datetime.replace(tzinfo=None) \
+                if not repo.in_scope(branch.name):
+                    continue
+                record = repo.ref_record(branch.name)
+                if deadline > record.committed_datetime.replace(tzinfo=None) \
                         and branch.name not in merged_branches:
-                    description = '{} {} has not been touched since {}'.format(name, branch.name, branch.commit.committed_datetime)
-                    section.append(Issue.error(description, obj=branch))
+                    description = '{} {} has not been touched since {}'.format(name, branch.name, record.committed_datetime)
+                    section.append(Issue.error(description, obj=record))
 
         _check_for_issues(branches=repo.branches(folder=self.gitflow.features), name='Feature')
         _check_for_issues(branches=repo.branches(folder=self.gitflow.fixes), name='Fix')
@@ -143,6 +233,12 @@ class NotScopedBranchesVisitor(BaseVisitor):
     def rule(self) -> str:
         return 'no_orphan_branches'
 
+    def dependencies(self, repo: Repository) -> List[str]:
+        return self._folders(repo, '')
+
+    def branch_folders(self, repo: Repository) -> List[str]:
+        return self._folders(repo, '')
+
     def visit(self, repo: Repository, **kwargs) -> Section:
         section = Section(rule=self.rule, title='Checked if repo contains orphan branches (created out of expected '
                                                 'folders)')
@@ -170,9 +266,11 @@ class NotScopedBranchesVisitor(BaseVisitor):
                     return True
             return False
 
-        orphan_branches = [branch for branch in repo.branches() if not has_expected_prefix(branch=branch)]
+        orphan_branches = [branch for branch in repo.branches()
+                           if repo.in_scope(branch.name) and not has_expected_prefix(branch=branch)]
         for branch in orphan_branches:
-            section.append(Issue.error('{branch} looks like created out of expected scopes'.format(branch=branch.name), obj=branch))
+            section.append(Issue.error('{branch} looks like created out of expected scopes'.format(branch=branch.name),
+                                       obj=repo.ref_record(branch.name)))
 
         return section
 
@@ -185,21 +283,25 @@ class MainCommitsAreTaggedVisitor(BaseVisitor):
     def rule(self) -> str:
         return 'master_must_have_tags'
 
+    def dependencies(self, repo: Repository) -> List[str]:
+        return self._folders(repo, self.gitflow.master) + [TAGS]
+
     def visit(self, repo: Repository, **kwargs) -> Section:
         section = Section(rule=self.rule, title='Checked if main repo branch has tagged commits')
         main_branch = '/'.join([repo.remote.name, self.gitflow.master])
-        main_commits = repo.raw_query(
-            lambda git: git.log(main_branch, '--merges', '--format=format:%H', '--first-parent'),
-            predicate=lambda sha: sha)
-        tags = repo.repo.tags
-        tags_sha = [tag.commit.hexsha for tag in tags]
-        tags_not_on_main_branch = [sha for sha in tags_sha if sha not in main_commits]
-        main_commits_not_tagged = [commit for commit in main_commits if commit not in tags_sha]
-
+        main_commits = [commit for commit in repo.graph.first_parents(repo.sha(main_branch)) if commit.is_merge]
+        main_shas = {commit.sha for commit in main_commits}
+        tags_by_commit = repo.tags_by_commit()
+        tags_not_on_main_branch = [record.commit_sha or record.sha
+                                   for name, record in repo.ref_table().items()
+                                   if name.startswith(TAGS) and record.commit_sha not in main_shas]
+        main_commits_not_tagged = [commit.sha for commit in main_commits
+                                   if commit.sha not in tags_by_commit and repo.may_be_in_window(commit.committed_date)]
+
+        commits = repo.objects.commits(main_commits_not_tagged)
         for main_commit_not_tagged in main_commits_not_tagged:
-            object = next(iter([tag for tag in tags if tag.commit.hexsha.startswith(main_commit_not_tagged)]))
             section.append(Issue.error('{commit} commit in main branch is not tagged'
-                                       .format(commit=main_commit_not_tagged[:8]), obj=object))
+                                       .format(commit=main_commit_not_tagged[:8]), obj=commits[main_commit_not_tagged]))
 
         for tag_not_on_main in tags_not_on_main_branch:
             section.append(Issue.warning('{commit} commit contains a tag but is not a part of the master branch'
@@ -220,38 +322,53 @@ class NoDirectCommitsToProtectedBranches(BaseVisitor):
     def rule(self) -> str:
         return 'no_direct_commits_to_protected_branches'
 
+    def dependencies(self, repo: Repository) -> List[str]:
+        return self._folders(repo, self.gitflow.master, self.gitflow.develop)
+
     def visit(self, repo: Repository, *args, **kwargs) -> Section:
+        potential_fast_forwards = {
+            branch: set(repo.iter_raw_query(lambda git: git.reflog('show', branch, '--format=format:%H'),
+                                            predicate=lambda sha: sha))
+            for branch in self._protected_branches(repo)
+        }
+        return self._section(repo, potential_fast_forwards=potential_fast_forwards)
+
+    async def visit_async(self, repo: AsyncRepository, *args, **kwargs) -> Section:
+        branches = self._protected_branches(repo)
+        reflogs = await asyncio.gather(
+            *[repo.git('reflog', 'show', branch, '--format=format:%H', predicate=lambda sha: sha)
+              for branch in branches])
+        return self._section(repo.repository,
+                             potential_fast_forwards={branch: set(reflog) for branch, reflog in zip(branches, reflogs)})
+
+    def _protected_branches(self, repo: Repository) -> List[str]:
+        return ['/'.join([repo.remote.name, self.gitflow.develop]), '/'.join([repo.remote.name, self.gitflow.master])]
+
+    def _section(self, repo: Repository, potential_fast_forwards: Dict[str, set]) -> Section:
+        """
+        :param potential_fast_forwards: SHAs of commits from the reflog of each protected branch
+        """
         section = Section(rule=self.rule, title='Checked if {} and {} contain only merges without direct commits'
                           .format(self.gitflow.develop, self.gitflow.master))
-        initial_commit = next(iter(repo.raw_query(lambda git: git.log('--format=format:%s', '--reverse'))))
+
+        initial_commits = repo.root_commits()
 
         def _get_direct_commits(branch: str) -> List[str]:
-            merges = repo.raw_query(
-                lambda git: git.log(branch, '--merges', '--format=format:%H', '--first-parent'),
-                predicate=lambda sha: sha)
-            potential_fast_forwards = repo.raw_query(
-                lambda git: git.reflog('show', branch, '--format=format:%H'),
-                predicate=lambda sha: sha)
-            all_commits = repo.raw_query(
-                lambda git: git.log(branch, '--format=format:%H', '--first-parent'),
-                predicate=lambda sha: sha)
-            return [sha for sha in all_commits if sha not in merges and sha not in potential_fast_forwards]
+            return [commit.sha for commit in repo.graph.first_parents(repo.sha(branch))
+                    if not commit.is_merge and commit.sha not in potential_fast_forwards[branch]
+                    and commit.sha not in initial_commits and repo.may_be_in_window(commit.committed_date)]
 
         def _get_issues(direct_commits: List[str], branch: str) -> List[Issue]:
-            issuers = [repo.commit(sha, branch) for sha in direct_commits]
+            commits = repo.objects.commits(direct_commits)
+            issuers = [commits[sha] for sha in direct_commits]
             issue_msg_fmt = 'Branch {} contains commit "{}" that was pushed directly rather than merged'
             return [
                 Issue.error(issue_msg_fmt.format(branch, ' '.join([str(commit.hexsha)[:8], commit.summary.strip()])), obj=commit)
-                for commit in issuers if commit and commit.message.lower().strip() != initial_commit.lower().strip()
+                for commit in issuers if commit
             ]
-        
-        dev_branch = '/'.join([repo.remote.name, self.gitflow.develop])
-        main_branch = '/'.join([repo.remote.name, self.gitflow.master])
 
-        develop_results = _get_direct_commits(dev_branch)
-        master_results = _get_direct_commits(main_branch)
-        section.extend(_get_issues(direct_commits=develop_results, branch=dev_branch))
-        section.extend(_get_issues(direct_commits=master_results, branch=main_branch))
+        for branch in self._protected_branches(repo):
+            section.extend(_get_issues(direct_commits=_get_direct_commits(branch), branch=branch))
         return section
 
 
@@ -264,19 +381,21 @@ class VersionNamesConventionVisitor(BaseVisitor):
     def rule(self) -> str:
         return 'version_names_follow_convention'
 
+    def dependencies(self, repo: Repository) -> List[str]:
+        return self._folders(repo, self.gitflow.releases) + [TAGS]
+
     @arguments_checker(['version_regex'])
     def visit(self, repo: Repository, *args, **kwargs) -> Section:
-        import re
         section = Section(rule=self.rule, title='Checked if version names follow given convention')
-        releases = [branch for branch in repo.branches(self.gitflow.releases)]
-        tags = [tag for tag in repo.repo.tags]
+        releases = [repo.ref_record(branch.name) for branch in repo.branches(self.gitflow.releases)
+                    if repo.in_scope(branch.name)]
+        tags = [record for name, record in repo.ref_table().items() if name.startswith(TAGS) and repo.in_window(name)]
         version_reg = kwargs['version_regex']
 
-        def _validate_version(v: str) -> bool:
-            return re.search(version_reg, v) is not None
-
-        release_issues = [release for release in releases if not _validate_version(release.name.split('/')[-1])]
-        tags_issues = [tag for tag in tags if not _validate_version(tag.name)]
+        invalid = set(not_following_convention(version_reg, [release.name.split('/')[-1] for release in releases] +
+                                               [tag.name for tag in tags]))
+        release_issues = [release for release in releases if release.name.split('/')[-1] in invalid]
+        tags_issues = [tag for tag in tags if tag.name in invalid]
 
         section.extend(
             [Issue.error('Release {branch} does not follow name convention'.format(branch=release.name), obj=release) for release in
@@ -300,8 +419,13 @@ class DevBranchNamesFollowConvention(BaseVisitor):
     def rule(self) -> str:
         return 'dev_branch_names_follow_convention'
 
+    def dependencies(self, repo: Repository) -> List[str]:
+        return self._folders(repo, self.gitflow.features, self.gitflow.fixes)
+
+    def branch_folders(self, repo: Repository) -> List[str]:
+        return self._folders(repo, self.gitflow.features, self.gitflow.fixes)
+
     def visit(self, repo: Repository, *args, **kwargs) -> Section:
-        import re
         features_regex = kwargs.get('name_regex', None) if not kwargs.get('feature_name_regex', None) else kwargs.get(
             'feature_name_regex')
         bugfixes_regex = kwargs.get('name_regex', None) if not kwargs.get('bugfix_name_regex', None) else kwargs.get(
@@ -312,16 +436,17 @@ class DevBranchNamesFollowConvention(BaseVisitor):
         feature_prefix = '/'.join([repo.remote.name, self.gitflow.features, ''])
         bugfix_prefix = '/'.join([repo.remote.name, self.gitflow.fixes, ''])
 
-        def _is_valid(branch: str, regex: str) -> bool:
-            return re.search(regex, branch) is not None
+        def _issuers(folder: str, prefix: str, regex: str) -> list:
+            branches = [branch for branch in repo.branches(folder) if repo.in_scope(branch.name)]
+            invalid = set(not_following_convention(regex, [branch.name.replace(prefix, '') for branch in branches]))
+            return [branch for branch in branches if branch.name.replace(prefix, '') in invalid]
 
-        feature_issuers = [feature for feature in repo.branches(self.gitflow.features) if
-                           not _is_valid(branch=feature.name.replace(feature_prefix, ''), regex=features_regex)]
-        bugfix_issuers = [bugfix for bugfix in repo.branches(self.gitflow.fixes) if
-                          not _is_valid(branch=bugfix.name.replace(bugfix_prefix, ''), regex=bugfixes_regex)]
+        feature_issuers = _issuers(self.gitflow.features, prefix=feature_prefix, regex=features_regex)
+        bugfix_issuers = _issuers(self.gitflow.fixes, prefix=bugfix_prefix, regex=bugfixes_regex)
 
         issue_msg_fmt = '{branch} branch does not follow given convention'
-        issues = [Issue.error(issue_msg_fmt.format(branch=branch.name), obj=branch) for branch in (feature_issuers + bugfix_issuers)]
+        issues = [Issue.error(issue_msg_fmt.format(branch=branch.name), obj=repo.ref_record(branch.name))
+                  for branch in (feature_issuers + bugfix_issuers)]
 
         return Section(rule=self.rule, title='Checked if feature and bugfix names follow convention', issues=issues)
 
@@ -339,6 +464,13 @@ class DeadReleasesVisitor(BaseVisitor):
     def rule(self) -> str:
         return 'no_dead_releases'
 
+    def dependencies(self, repo: Repository) -> List[str]:
+        return self._folders(repo, self.gitflow.master, self.gitflow.develop, self.gitflow.releases,
+                             self.gitflow.hotfixes)
+
+    def branch_folders(self, repo: Repository) -> List[str]:
+        return self._folders(repo, self.gitflow.releases, self.gitflow.hotfixes)
+
     @arguments_checker(['deadline_to_close_release'])
     def visit(self, repo: Repository, *args, **kwargs) -> Section:
         section = Section(rule=self.rule, title='Checked if repo contains abandoned and not removed releases')
@@ -348,26 +480,23 @@ class DeadReleasesVisitor(BaseVisitor):
         release_branch = '/'.join([repo.remote.name, self.gitflow.releases, ''])
         hotfix_branch = '/'.format([repo.remote.name, self.gitflow.hotfixes, ''])
 
-        releases_not_merged_to_main = repo.raw_query(lambda git: git.branch('-r', '--no-merged', main_branch),
-                                                 predicate=lambda release: release.strip().startswith(
-                                                     release_branch) or release.strip().startswith(
-                                                     hotfix_branch),
-                                                 map_line=lambda release: repo.branch(release))
-        releases_not_merged_to_develop = repo.raw_query(lambda git: git.branch('-r', '--no-merged', dev_branch),
-                                                 predicate=lambda release: release.strip().startswith(
-                                                     release_branch) or release.strip().startswith(
-                                                     hotfix_branch),
-                                                 map_line=lambda release: repo.branch(release))
-
-        potential_dead_releases = [release for release in releases_not_merged_to_main if release in releases_not_merged_to_develop]
+        def _is_release(line: str) -> bool:
+            name = line.strip()
+            return (name.startswith(release_branch) or name.startswith(hotfix_branch)) and repo.in_scope(name)
+
+        releases_not_merged_to_main = [repo.ref_record(name) for name in sorted(repo.not_merged_into(main_branch))
+                                       if _is_release(name)]
+        releases_not_merged_to_develop = repo.not_merged_into(dev_branch)
+
+        potential_dead_releases = [release for release in releases_not_merged_to_main if release.name in releases_not_merged_to_develop]
         
-        releases_merged_only_into_develop = [release for release in releases_not_merged_to_main if release not in releases_not_merged_to_develop]
+        releases_merged_only_into_develop = [release for release in releases_not_merged_to_main if release.name not in releases_not_merged_to_develop]
 
         dead_releases = [dead_release for dead_release in potential_dead_releases if
-                         deadline > dead_release.commit.committed_datetime.replace(tzinfo=None)]
+                         deadline > dead_release.committed_datetime.replace(tzinfo=None)]
 
         suspicious_releases = [suspicious_release for suspicious_release in releases_merged_only_into_develop 
-                            if deadline > suspicious_release.commit.committed_datetime.replace(tzinfo=None)]
+                            if deadline > suspicious_release.committed_datetime.replace(tzinfo=None)]
 
         section.extend([
             Issue.error('{release} seems abandoned - it has never been merged into the {master} branch'.format(release=r.name, master=self.gitflow.master), obj=r) 
@@ -393,56 +522,102 @@ class DependantFeaturesVisitor(BaseVisitor):
     def rule(self) -> str:
         return 'no_dependant_features'
 
+    def dependencies(self, repo: Repository) -> List[str]:
+        return self._folders(repo, self.gitflow.develop, self.gitflow.features, self.gitflow.fixes) + \
+               repo.target_refs(self.gitflow.develop)
+
+    def branch_folders(self, repo: Repository) -> List[str]:
+        return self._folders(repo, self.gitflow.features, self.gitflow.fixes)
+
+    @staticmethod
+    def branches_sharing_commits(commits_in_branches: Dict[Hashable, Iterable[str]]) -> Dict[Hashable, list]:
+        """
+        Finds branches that share commits by using an inverted index (commit -> branches), so it is linear in the
+        number of commits instead of comparing every pair of branches
+
+        :param commits_in_branches: SHAs of commits of every branch
+        :return: branches that share commits with other branches, mapped to the other branches (in the order of
+            ``commits_in_branches``)
+        """
+        order = {branch: position for position, branch in enumerate(commits_in_branches.keys())}
+        branches_of_commit = dict()
+        for branch, commits in commits_in_branches.items():
+            for sha in set(commits):
+                branches_of_commit.setdefault(sha, []).append(branch)
+
+        groups_of_branch = dict()
+        for branches in branches_of_commit.values():
+            if len(branches) > 1:
+                group = tuple(branches)
+                for branch in branches:
+                    groups_of_branch.setdefault(branch, set()).add(group)
+
+        sharing = dict()
+        for branch in commits_in_branches.keys():
+            others = {other for group in groups_of_branch.get(branch, ()) for other in group if other != branch}
+            if others:
+                sharing[branch] = sorted(others, key=order.get)
+        return sharing
+
+    def related_branches(self, repo: Repository, names: Set[str]) -> Set[str]:
+        # issues of branches that share commits with given ones may change as well
+        sharing = self._branches_sharing_commits(repo, self._not_merged(repo))
+        return {other.name for feature, others in sharing.items() if feature.name in names for other in others}
+
+    def _not_merged(self, repo: Repository) -> list:
+        merged_branches = repo.merged_into(self.gitflow.develop)
+        return [repo.branch(b.name) for b in repo.branches(self.gitflow.features) if b.name not in merged_branches] + [repo.branch(b.name) for b in repo.branches(self.gitflow.fixes) if b.name not in merged_branches]
+
+    def _branches_sharing_commits(self, repo: Repository, not_merged: list) -> Dict[Hashable, list]:
+        # chained features or features that share commits
+        dev_branch = '/'.join([repo.remote.name, self.gitflow.develop])
+        commits_in_ft_branches = dict()
+        for feature in not_merged:
+            commits_in_ft_branches[feature] = repo.graph.only_in(repo.ref_record(feature.name).commit_sha,
+                                                                 excluded=repo.sha(dev_branch))
+        return self.branches_sharing_commits(commits_in_ft_branches)
+
     @arguments_checker(['max_dependant_branches'])
     def visit(self, repo: Repository, *args, **kwargs) -> Section:
         section = Section(rule=self.rule, title='Checked if repo contains dependant feature branches')
         dev_branch = '/'.join([repo.remote.name, self.gitflow.develop])
         max_dependant_branches = int(kwargs['max_dependant_branches'])
-        merged_branches = repo.raw_query(lambda git: git.branch('-r', '--merged', self.gitflow.develop))
-        not_merged = [repo.branch(b.name) for b in repo.branches(self.gitflow.features) if b.name not in merged_branches] + [repo.branch(b.name) for b in repo.branches(self.gitflow.fixes) if b.name not in merged_branches]
-        branch_issue_format = '{} seems to depend on other feature branches. It contains following merges: {}'
+        not_merged = self._not_merged(repo)
         problematic_branch_sep = os.linesep + '\t\t\t- '
+        issues_in_ft_branch = self._branches_sharing_commits(repo, not_merged)
 
-        for feature in not_merged:
-            name = feature.name
-            merge_commits_query = repo.raw_query(lambda git: git.log('..'.join([dev_branch, name]), '--merges',
-                                                                     '--first-parent', '--format=format:%H'))
-            merge_commits_sha = [commit_sha.strip() for commit_sha in merge_commits_query]
-            merge_commits_in_feature = [commit for commit in repo.repo.iter_commits(name, max_count=200) if
-                                        commit.hexsha in merge_commits_sha]
+        branch_issue_format = '{} seems to depend on other feature branches. It contains following merges: {}'
+        dev_commits = repo.graph.ancestors(repo.sha(dev_branch))
+        merge_commits_in_features = {
+            feature.name: [commit for commit in repo.graph.first_parents(repo.ref_record(feature.name).commit_sha,
+                                                                         exclude=dev_commits)
+                           if commit.is_merge]
+            for feature in not_merged if repo.in_scope(feature.name)
+        }
+        # the graph keeps only subjects, whole messages of merges are read at once
+        messages = repo.objects.commits({commit.sha for commits in merge_commits_in_features.values()
+                                         for commit in commits})
+        for name, merge_commits_in_feature in merge_commits_in_features.items():
             branch_issues = [commit for commit in merge_commits_in_feature if
-                             self.gitflow.develop not in commit.message]
+                             self.gitflow.develop not in messages[commit.sha].message]
 
             if branch_issues:
                 is_limit_exceeded = len(branch_issues) > max_dependant_branches
                 issue_level = Level.ERROR if is_limit_exceeded else Level.WARNING
-                issues_titles = [next(iter(commit.message.split(os.linesep)), None) for commit in branch_issues]
+                issues_titles = [commit.summary for commit in branch_issues]
                 issue_desc = branch_issue_format.format(name, problematic_branch_sep + problematic_branch_sep.join(issues_titles))
-                section.append(Issue(level=issue_level, description=issue_desc, obj=feature))
+                section.append(Issue(level=issue_level, description=issue_desc, obj=repo.ref_record(name)))
 
-        # chained features or features that share commits
-        commits_in_ft_branches = dict()
-        issues_in_ft_branch = dict()
         branch_issue_format = '{} seems to depend on other feature branches. It shares commits with following branches: {}'
-        for feature in not_merged:
-            commit_hashes = repo.raw_query(lambda git: git.rev_list('--left-right','..'.join([dev_branch, feature.name])))
-            commits_in_ft_branches[feature] = commit_hashes
-
-        for feature in commits_in_ft_branches.keys():
-            other_dependant_ft_branches = [
-                ft for ft in commits_in_ft_branches.keys() 
-                if ft != feature and any(hash_c in commits_in_ft_branches[feature] for hash_c in commits_in_ft_branches[ft])
-            ]
-            if other_dependant_ft_branches:
-                issues_in_ft_branch[feature] = other_dependant_ft_branches
-        
         for feature in issues_in_ft_branch.keys():
+            if not repo.in_scope(feature.name):
+                continue
             is_limit_exceeded = len(issues_in_ft_branch[feature]) > max_dependant_branches
             issue_level = Level.ERROR if is_limit_exceeded else Level.WARNING
             problematic_branches_names = [b.name for b in issues_in_ft_branch[feature]]
             dependant_branches = problematic_branch_sep + problematic_branch_sep.join(problematic_branches_names)
             issue_desc = branch_issue_format.format(feature.name, dependant_branches)
-            section.append(Issue(level=issue_level, description=issue_desc, obj=feature))
+            section.append(Issue(level=issue_level, description=issue_desc, obj=repo.ref_record(feature.name)))
 
         return section
 
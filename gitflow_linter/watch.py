@@ -0,0 +1,181 @@
+"""
+Watch mode of the linter, run by ``--watch`` option.
+
+The repository is opened once and kept warm: references are polled for changes (and fetched periodically if asked to)
+and rules are checked again only when references they depend on have changed. The commit graph is extended only by
+new commits, results of rules are cached in memory and rules checking branches one by one check only changed branches
+(see :class:`LintState <gitflow_linter.state.LintState>`). The latest report is served by a local HTTP server.
+"""
+import copy
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from gitflow_linter import output
+from gitflow_linter.cache import MemoryResultCache
+from gitflow_linter.report import Report
+from gitflow_linter.repository import Repository
+from gitflow_linter.rules import Gitflow, RulesContainer
+from gitflow_linter.state import LintState
+
+HOST = '127.0.0.1'
+
+
+class Watcher:
+    """
+    Lints the repository again whenever its references change and keeps the latest report.
+
+    :param settings: parsed yaml settings, rules are taken from them for every run
+    :param fetch_interval: the remote is fetched (pruning deleted branches) every that many seconds, never if not given
+    """
+
+    def __init__(self, repo: Repository, gitflow: Gitflow, settings: dict, jobs: int = 1,
+                 fetch_interval: Optional[float] = None):
+        self.repo = repo
+        self.gitflow = gitflow
+        self.settings = settings
+        self.jobs = jobs
+        self.fetch_interval = fetch_interval
+        self.cache = MemoryResultCache()
+        self.state: Optional[LintState] = None
+        self.report: Optional[Report] = None
+        self.updated: Optional[datetime] = None
+        self.runs = 0
+        self._signature = None
+        self._fetched = time.monotonic()
+
+    def lint(self) -> Report:
+        """
+        Checks all rules, the ones whose references have not changed since the previous run are served from the cache
+
+        :return: the report containing only issues introduced in the date window of the repository
+        """
+        from gitflow_linter import lint
+
+        rules = RulesContainer(rules=copy.deepcopy(self.settings))
+        rules_args = {rule: rules.args_for(rule) for rule in rules.rules}
+        self.report = lint(self.repo, gitflow=self.gitflow, rules=rules, jobs=self.jobs, cache=self.cache,
+                           state=self.state)
+        self.cache.evict()
+        self.state = LintState(created=date.today().isoformat(), refs=self.repo.ref_state(), args=rules_args,
+                               report=self.report, window=LintState.window_of(self.repo))
+        self.updated = datetime.now()
+        self.runs += 1
+        return self.report
+
+    def poll(self) -> bool:
+        """
+        Fetches the remote if it is time to and lints the repository again if references have changed or the day
+        has changed (since some of rules depend on time)
+
+        :return: ``True`` if the repository has been linted again
+        """
+        if self.fetch_interval and time.monotonic() - self._fetched >= self.fetch_interval:
+            self._fetched = time.monotonic()
+            self.repo.remote.fetch(prune=True)
+
+        signature = self._ref_files_signature()
+        new_day = self.state is None or self.state.created != date.today().isoformat()
+        if signature == self._signature and not new_day:
+            return False
+        # taken before references are read, so changes made in the meantime are noticed by the next poll
+        self._signature = signature
+        if not self.repo.update() and not new_day:
+            return False
+        self.lint()
+        return True
+
+    def watch(self, interval: float, stop: threading.Event, on_report: callable = None):
+        """
+        Lints the repository and then polls it every ``interval`` seconds until ``stop`` is set. Errors are logged,
+        so a failed poll (eg. the remote cannot be fetched) does not stop watching.
+
+        :param on_report: called with the report after every run
+        """
+        self._signature = self._ref_files_signature()
+        self.lint()
+        if on_report:
+            on_report(self.report)
+        while not stop.wait(interval):
+            try:
+                if self.poll() and on_report:
+                    on_report(self.report)
+            except Exception as err:
+                output.log.error('❌ Repository cannot be checked because of error: {}'.format(err))
+
+    def status(self) -> dict:
+        """
+        :return: JSON serializable summary of the latest report
+        """
+        return {
+            'repository': self.repo.repo.working_dir,
+            'updated': self.updated.isoformat(timespec='seconds') if self.updated else None,
+            'runs': self.runs,
+            'errors': self.report.contains_errors(are_warnings_errors=False) if self.report else None,
+            'warnings': any(section.contains_warns for section in self.report.sections) if self.report else None,
+        }
+
+    def _ref_files_signature(self) -> tuple:
+        """
+        Modification times and sizes of files git keeps references in, so changes are noticed without running git
+        """
+        git_dir = self.repo.repo.common_dir
+        files = [os.path.join(git_dir, 'packed-refs')]
+        for folder in ('refs/remotes/{}'.format(self.repo.remote.name), 'refs/tags', 'refs/heads', 'reftable'):
+            for root, _, names in os.walk(os.path.join(git_dir, *folder.split('/'))):
+                files.extend(os.path.join(root, name) for name in names)
+        signature = []
+        for path in sorted(files):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+
+class _ReportRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves ``GET /`` (the latest report, the same JSON as ``--output json`` prints) and ``GET /status``
+    """
+
+    def do_GET(self):
+        watcher: Watcher = self.server.watcher
+        path = self.path.split('?')[0].rstrip('/')
+        if path in ('', '/report'):
+            report = watcher.report
+            if report is None:
+                return self._respond(503, {'error': 'The repository has not been checked yet'})
+            return self._respond(200, output._report_to_dict(report))
+        if path == '/status':
+            return self._respond(200, watcher.status())
+        return self._respond(404, {'error': 'Not found: {}'.format(self.path)})
+
+    def _respond(self, code: int, body: dict):
+        payload = json.dumps(body, indent=2).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        output.log.debug(format, *args)
+
+
+def serve(watcher: Watcher, port: int, host: str = HOST) -> ThreadingHTTPServer:
+    """
+    Starts the HTTP server serving the latest report of the watcher in a daemon thread
+
+    :param port: port to listen on, ``0`` lets the system choose a free one (see ``server.server_address``)
+    :return: the running server, stopped by ``shutdown()``
+    """
+    server = ThreadingHTTPServer((host, port), _ReportRequestHandler)
+    server.daemon_threads = True
+    server.watcher = watcher
+    threading.Thread(target=server.serve_forever, name='gitflow-linter-http', daemon=True).start()
+    return server
@@ -23,6 +23,8 @@ setup(
         'console_scripts': [
             'gitflow-linter = gitflow_linter:main',
             'gitflow-linter-plugins = gitflow_linter:available_plugins',
+            'gitflow-linter-batch = gitflow_linter:batch',
+            'gitflow-linter-bench = gitflow_linter:bench',
         ],
     },
     classifiers=[
@@ -0,0 +1,111 @@
+import os
+import subprocess
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from git import Repo
+
+from gitflow_linter.repository import Repository
+from gitflow_linter.rules import Gitflow, RulesContainer
+
+
+class GitflowFixture:
+    """
+    Local bare ``origin`` repository, a working clone pushing to it and the clone that is linted
+    """
+
+    def __init__(self, directory: str):
+        self.origin = os.path.join(directory, 'origin.git')
+        self.work = os.path.join(directory, 'work')
+        self.clone = os.path.join(directory, 'clone')
+        self.gitflow = Gitflow(settings={})
+
+    def git(self, cwd: str, *args: str, date: datetime = None) -> str:
+        env = dict(os.environ, GIT_AUTHOR_NAME='linter', GIT_AUTHOR_EMAIL='linter@example.com',
+                   GIT_COMMITTER_NAME='linter', GIT_COMMITTER_EMAIL='linter@example.com')
+        if date:
+            env.update(GIT_AUTHOR_DATE=date.isoformat(), GIT_COMMITTER_DATE=date.isoformat())
+        return subprocess.run(['git', '-c', 'init.defaultBranch=master', '-c', 'commit.gpgsign=false'] + list(args),
+                              cwd=cwd, env=env, check=True, capture_output=True, text=True).stdout
+
+    def commit(self, message: str, date: datetime = None):
+        self.git(self.work, 'commit', '--allow-empty', '-m', message, date=date)
+
+    def repository(self) -> Repository:
+        return Repository(Repo(self.clone), gitflow=self.gitflow)
+
+    @staticmethod
+    def rules(rules: dict) -> RulesContainer:
+        return RulesContainer(rules={'rules': rules})
+
+
+@pytest.fixture
+def gitflow_repo(tmp_path) -> GitflowFixture:
+    """
+    Repository with ``master``, ``develop`` and an old ``feature/5-old`` branch that is merged into ``origin/develop``
+    but not into the local ``develop`` of the linted clone, since the clone has only fetched the merge
+    """
+    fixture = GitflowFixture(str(tmp_path))
+    fixture.git(str(tmp_path), 'init', '--bare', fixture.origin)
+    fixture.git(str(tmp_path), 'clone', fixture.origin, fixture.work)
+    fixture.commit('Initial commit')
+    fixture.git(fixture.work, 'checkout', '-b', 'develop')
+    fixture.git(fixture.work, 'checkout', '-b', 'feature/5-old')
+    fixture.commit('Old feature', date=datetime.now() - timedelta(days=100))
+    fixture.git(fixture.work, 'push', 'origin', 'master', 'develop', 'feature/5-old')
+    fixture.git(str(tmp_path), 'clone', fixture.origin, fixture.clone)
+    fixture.git(fixture.clone, 'checkout', 'develop')
+
+    fixture.git(fixture.work, 'checkout', 'develop')
+    fixture.git(fixture.work, 'merge', '--no-ff', '-m', 'Merge branch feature/5-old into develop', 'feature/5-old')
+    fixture.git(fixture.work, 'push', 'origin', 'develop')
+    fixture.git(fixture.clone, 'fetch', 'origin')
+    return fixture
+
+
+@pytest.fixture
+def history_repo(tmp_path) -> GitflowFixture:
+    """
+    Repository with merged and open (chained) features, a release merged into master and back into develop,
+    lightweight and annotated tags, commits made in several timezones and three root commits: the initial one, an
+    unrelated history merged into develop and an orphan spike branch
+    """
+    fixture = GitflowFixture(str(tmp_path))
+    fixture.git(str(tmp_path), 'init', '--bare', fixture.origin)
+    fixture.git(str(tmp_path), 'clone', fixture.origin, fixture.work)
+    fixture.commit('Initial commit', date=datetime(2021, 1, 4, 10, tzinfo=timezone(timedelta(hours=1))))
+    fixture.git(fixture.work, 'tag', '0.1')
+    fixture.git(fixture.work, 'checkout', '-b', 'develop')
+
+    fixture.git(fixture.work, 'checkout', '-b', 'feature/1-login')
+    fixture.commit('Login form', date=datetime(2021, 2, 1, 12, tzinfo=timezone(timedelta(hours=5, minutes=30))))
+    fixture.commit('Login action', date=datetime(2021, 2, 2, 12, tzinfo=timezone(timedelta(hours=5, minutes=30))))
+    fixture.git(fixture.work, 'checkout', 'develop')
+    fixture.git(fixture.work, 'merge', '--no-ff', '-m', 'Merge branch feature/1-login into develop', 'feature/1-login')
+
+    fixture.git(fixture.work, 'checkout', '-b', 'feature/2-logout')
+    fixture.commit('Logout', date=datetime(2021, 3, 1, 8, tzinfo=timezone(timedelta(hours=-8))))
+    fixture.git(fixture.work, 'tag', '-a', '0.9-rc', '-m', 'Release candidate')
+    fixture.git(fixture.work, 'checkout', '-b', 'feature/3-profile')
+    fixture.commit('Profile')
+
+    fixture.git(fixture.work, 'checkout', '--orphan', 'docs')
+    fixture.commit('Documentation root', date=datetime(2021, 3, 5, 8, tzinfo=timezone(timedelta(hours=-3))))
+    fixture.git(fixture.work, 'checkout', 'develop')
+    fixture.git(fixture.work, 'merge', '--no-ff', '--allow-unrelated-histories', '-m', 'Merge documentation', 'docs')
+
+    fixture.git(fixture.work, 'checkout', '-b', 'release/1.0')
+    fixture.commit('Bump version')
+    fixture.git(fixture.work, 'checkout', 'master')
+    fixture.git(fixture.work, 'merge', '--no-ff', '-m', 'Merge branch release/1.0', 'release/1.0')
+    fixture.git(fixture.work, 'tag', '-a', '1.0', '-m', 'Release 1.0')
+    fixture.git(fixture.work, 'checkout', 'develop')
+    fixture.git(fixture.work, 'merge', '--no-ff', '-m', 'Merge branch release/1.0 into develop', 'release/1.0')
+
+    fixture.git(fixture.work, 'checkout', '--orphan', 'spike/other')
+    fixture.commit('Spike root')
+    fixture.git(fixture.work, 'push', 'origin', '--all')
+    fixture.git(fixture.work, 'push', 'origin', '--tags')
+    fixture.git(str(tmp_path), 'clone', fixture.origin, fixture.clone)
+    fixture.git(fixture.clone, 'checkout', 'develop')
+    return fixture
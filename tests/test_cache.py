@@ -0,0 +1,46 @@
+from gitflow_linter import lint
+from gitflow_linter.cache import ResultCache
+from gitflow_linter.visitor import OldDevelopmentBranchesVisitor
+
+RULES = {'no_old_development_branches': {'max_days_features': 50}}
+
+
+def _issues(repo, fixture, cache) -> list:
+    try:
+        report = lint(repo, gitflow=fixture.gitflow, rules=fixture.rules(RULES), cache=cache)
+    finally:
+        repo.close()
+    return [issue.description for section in report.sections for issue in section.issues]
+
+
+def test_cached_result_is_not_reused_when_local_merge_target_moves(gitflow_repo, tmp_path):
+    cache = ResultCache(directory=str(tmp_path / 'cache'))
+    issues = _issues(gitflow_repo.repository(), gitflow_repo, cache)
+    assert len(issues) == 1 and 'origin/feature/5-old has not been touched' in issues[0]
+
+    gitflow_repo.git(gitflow_repo.clone, 'merge', '--ff-only', 'origin/develop')
+
+    assert _issues(gitflow_repo.repository(), gitflow_repo, cache) == []
+    assert _issues(gitflow_repo.repository(), gitflow_repo, cache=None) == []
+
+
+def test_cached_result_is_reused_when_references_do_not_change(gitflow_repo, tmp_path):
+    cache = ResultCache(directory=str(tmp_path / 'cache'))
+    first = _issues(gitflow_repo.repository(), gitflow_repo, cache)
+
+    repo = gitflow_repo.repository()
+    visitor = OldDevelopmentBranchesVisitor(gitflow=gitflow_repo.gitflow)
+    fingerprint = cache.fingerprint(repo, visitor, RULES['no_old_development_branches'])
+    assert cache.get(fingerprint) is not None
+    assert _issues(repo, gitflow_repo, cache) == first
+
+
+def test_results_do_not_change_when_cache_cannot_be_written(gitflow_repo, tmp_path, caplog):
+    (tmp_path / 'file').write_text('not a directory')
+    cache = ResultCache(directory=str(tmp_path / 'file' / 'cache'))
+
+    issues = _issues(gitflow_repo.repository(), gitflow_repo, cache)
+    cache.evict()
+
+    assert issues == _issues(gitflow_repo.repository(), gitflow_repo, cache=None) and len(issues) == 1
+    assert 'cannot be cached' in caplog.text
@@ -0,0 +1,36 @@
+from gitflow_linter import lint
+from gitflow_linter.repository import Repository
+
+RULES = {
+    'master_must_have_tags': {},
+    'no_direct_commits_to_protected_branches': {},
+    'no_orphan_branches': {},
+    'no_dependant_features': {'max_dependant_branches': 0},
+}
+
+
+def test_forks_are_closed_once_rules_are_checked_concurrently(history_repo, monkeypatch):
+    fork, close = Repository.fork, Repository.close
+    forks, closed = [], []
+    monkeypatch.setattr(Repository, 'fork', lambda self: forks.append(fork(self)) or forks[-1])
+    monkeypatch.setattr(Repository, 'close', lambda self: closed.append(self) or close(self))
+
+    repo = history_repo.repository()
+    report = lint(repo, gitflow=history_repo.gitflow, rules=history_repo.rules(RULES), jobs=3)
+
+    assert len(report.sections) == len(RULES)
+    assert forks and all(any(forked is repository for repository in closed) for forked in forks)
+    assert not any(repository is repo for repository in closed)
+    repo.close()
+
+
+def test_options_of_a_single_run_are_rejected_in_watch_mode(history_repo, tmp_path, caplog):
+    from click.testing import CliRunner
+    from gitflow_linter import main
+    settings = tmp_path / 'settings.yaml'
+    settings.write_text('rules:\n  no_orphan_branches: {}\n')
+
+    result = CliRunner().invoke(main, [history_repo.clone, '-s', str(settings), '--watch', '--cache', '-o', 'json'])
+
+    assert result.exit_code == 1
+    assert '--output, --cache cannot be used together with --watch' in caplog.text
@@ -0,0 +1,90 @@
+import pytest
+
+from gitflow_linter.repository import HEADS, TAGS
+
+
+@pytest.fixture
+def repo(history_repo):
+    repository = history_repo.repository()
+    yield repository
+    repository.close()
+
+
+def _rev_list(fixture, *args: str) -> list:
+    return fixture.git(fixture.clone, 'rev-list', *args).split()
+
+
+def _branches(repo) -> dict:
+    return {name: record.commit_sha for name, record in repo.ref_table().items()
+            if not name.startswith(TAGS) and not name.startswith(HEADS) and name != 'origin/HEAD'}
+
+
+def test_graph_contains_history_of_remote_branches_and_tags(repo, history_repo):
+    expected = _rev_list(history_repo, '--remotes=origin', '--tags')
+    assert len(repo.graph) == len(expected) and all(sha in repo.graph for sha in expected)
+
+
+def test_first_parents_follow_git_rev_list(repo, history_repo):
+    for name, sha in _branches(repo).items():
+        assert [commit.sha for commit in repo.graph.first_parents(sha)] == \
+               _rev_list(history_repo, '--first-parent', sha), name
+
+
+def test_ancestors_and_only_in_follow_git_rev_list(repo, history_repo):
+    develop = repo.sha('origin/develop')
+    for name, sha in _branches(repo).items():
+        assert repo.graph.ancestors(sha) == set(_rev_list(history_repo, sha)), name
+        assert set(repo.graph.only_in(sha, excluded=develop)) == \
+               set(_rev_list(history_repo, '{}..{}'.format(develop, sha))), name
+
+
+
+def test_unique_to_follows_git_rev_list_not(repo, history_repo):
+    branches = _branches(repo)
+    for name, sha in branches.items():
+        others = [other for other_name, other in branches.items() if other_name != name]
+        expected = set(_rev_list(history_repo, sha, '--not', *others))
+        assert repo.graph.unique_to(sha, others=others) == expected, name
+        unique = {commit.hexsha for commit in repo.unique_commits_for_branch(repo.branch(name))}
+        assert unique == expected | {sha}, name
+
+
+@pytest.mark.parametrize('target', ['develop', 'master', 'origin/develop', 'origin/master', 'origin/feature/2-logout',
+                                    '1.0', '0.9-rc'])
+def test_merged_into_follows_git_branch_merged(repo, history_repo, target):
+    lines = history_repo.git(history_repo.clone, 'branch', '-r', '--merged', target).splitlines()
+    expected = {line.strip().split(' -> ')[0] for line in lines if line.strip()}
+    assert repo.merged_into(target) == expected
+    assert repo.not_merged_into(target) == (set(_branches(repo)) | {'origin/HEAD'}) - expected
+
+
+def test_ref_records_follow_git_for_each_ref(repo, history_repo):
+    lines = history_repo.git(history_repo.clone, 'for-each-ref', '--format=%(refname) %(objectname)',
+                             'refs/remotes/origin', 'refs/tags', 'refs/heads').splitlines()
+    refs = dict(line.split() for line in lines)
+    table = repo.ref_table()
+    assert len(table) == len(refs)
+    for refname, sha in refs.items():
+        name = refname[len('refs/remotes/'):] if refname.startswith('refs/remotes/') else refname
+        record = table[name]
+        commit_sha = history_repo.git(history_repo.clone, 'rev-parse', refname + '^{commit}').strip()
+        committed = history_repo.git(history_repo.clone, 'log', '-1', '--format=%cI', commit_sha).strip()
+        assert (record.sha, record.commit_sha) == (sha, commit_sha), name
+        assert record.committed_datetime.isoformat() == committed, name
+
+
+def test_tags_by_commit_follow_peeled_tags(repo, history_repo):
+    lines = history_repo.git(history_repo.clone, 'for-each-ref',
+                             '--format=%(refname:short) %(objectname) %(*objectname)', 'refs/tags').splitlines()
+    expected = {}
+    for line in lines:
+        name, sha, *peeled = line.split()
+        expected.setdefault(peeled[0] if peeled else sha, set()).add(name)
+    assert {sha: {record.name for record in records} for sha, records in repo.tags_by_commit().items()} == expected
+    assert any(peeled for line in lines for peeled in line.split()[2:])
+
+
+def test_root_commits_follow_git_rev_list_max_parents(repo, history_repo):
+    expected = set(_rev_list(history_repo, '--max-parents=0', '--remotes=origin', '--tags'))
+    assert len(expected) == 3
+    assert repo.root_commits() == expected
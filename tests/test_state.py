@@ -0,0 +1,68 @@
+from datetime import date
+
+from gitflow_linter import lint
+from gitflow_linter.state import LintState
+
+RULES = {'no_old_development_branches': {'max_days_features': 50}}
+
+
+def _lint(fixture, state=None):
+    repo = fixture.repository()
+    try:
+        report = lint(repo, gitflow=fixture.gitflow, rules=fixture.rules(RULES), state=state)
+        state = LintState(created=date.today().isoformat(), refs=repo.ref_state(), args=RULES, report=report,
+                          window=LintState.window_of(repo))
+    finally:
+        repo.close()
+    return [issue.description for section in report.sections for issue in section.issues], state
+
+
+def test_issues_are_not_carried_forward_when_local_merge_target_moves(gitflow_repo):
+    issues, state = _lint(gitflow_repo)
+    assert len(issues) == 1 and 'origin/feature/5-old has not been touched' in issues[0]
+
+    gitflow_repo.git(gitflow_repo.clone, 'merge', '--ff-only', 'origin/develop')
+
+    issues, next_state = _lint(gitflow_repo, state=state)
+    assert 'refs/heads/develop' in state.changed(next_state.refs)
+    assert issues == []
+
+
+def test_issues_are_carried_forward_when_references_do_not_change(gitflow_repo):
+    issues, state = _lint(gitflow_repo)
+    assert _lint(gitflow_repo, state=state)[0] == issues
+
+
+def test_report_is_returned_when_state_cannot_be_recorded(gitflow_repo, tmp_path, caplog):
+    from gitflow_linter import _lint
+    (tmp_path / 'file').write_text('not a directory')
+
+    report = _lint(gitflow_repo.clone, gitflow=gitflow_repo.gitflow, rules=gitflow_repo.rules(RULES),
+                   since_state=str(tmp_path / 'file' / 'state.json'))
+
+    assert len(report.sections) == 1 and len(report.sections[0].issues) == 1
+    assert 'State cannot be recorded' in caplog.text
+
+
+def test_issues_of_branches_sharing_commits_with_changed_ones_are_checked_again(history_repo):
+    rules = {'no_dependant_features': {'max_dependant_branches': 0}}
+
+    def issues_of(state=None):
+        repo = history_repo.repository()
+        try:
+            report = lint(repo, gitflow=history_repo.gitflow, rules=history_repo.rules(rules), state=state)
+            state = LintState(created=date.today().isoformat(), refs=repo.ref_state(), args=rules, report=report,
+                              window=LintState.window_of(repo))
+        finally:
+            repo.close()
+        return sorted(issue.description for section in report.sections for issue in section.issues), state
+
+    _, state = issues_of()
+    history_repo.git(history_repo.work, 'checkout', '-b', 'feature/4-avatar', 'feature/2-logout')
+    history_repo.commit('Avatar')
+    history_repo.git(history_repo.work, 'push', 'origin', 'feature/4-avatar')
+    history_repo.git(history_repo.clone, 'fetch', 'origin')
+
+    issues, _ = issues_of(state=state)
+    assert any('origin/feature/4-avatar' in issue for issue in issues if issue.startswith('origin/feature/2-logout'))
+    assert issues == issues_of()[0]
@@ -0,0 +1,30 @@
+from gitflow_linter import lint
+
+RULES = {'no_dependant_features': {'max_dependant_branches': 0}}
+
+
+def _merge_feature(fixture, name: str, merged: str, message: str):
+    fixture.git(fixture.work, 'checkout', '-b', merged, 'develop')
+    fixture.commit('Work on {}'.format(merged))
+    fixture.git(fixture.work, 'checkout', '-b', name, 'develop')
+    fixture.commit('Work on {}'.format(name))
+    fixture.git(fixture.work, 'merge', '--no-ff', '-m', message, merged)
+    fixture.git(fixture.work, 'push', 'origin', name, merged)
+
+
+def test_merges_mentioning_develop_in_message_body_are_not_dependencies(gitflow_repo):
+    _merge_feature(gitflow_repo, 'feature/6-synced', 'feature/7-base',
+                   'Merge branch feature/7-base\n\nIt brings changes of develop as well')
+    _merge_feature(gitflow_repo, 'feature/8-dependant', 'feature/9-base', 'Merge branch feature/9-base')
+    gitflow_repo.git(gitflow_repo.clone, 'fetch', 'origin')
+
+    repo = gitflow_repo.repository()
+    try:
+        report = lint(repo, gitflow=gitflow_repo.gitflow, rules=gitflow_repo.rules(RULES))
+    finally:
+        repo.close()
+    merges = [issue.description for issue in report.sections[0].issues
+              if 'contains following merges' in issue.description]
+
+    assert len(merges) == 1
+    assert merges[0].startswith('origin/feature/8-dependant') and 'Merge branch feature/9-base' in merges[0]